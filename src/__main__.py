@@ -0,0 +1,124 @@
+"""
+Analyze a review file and write one JSON line of aspects per review.
+
+Reviews are read, analyzed and written as a stream, so memory stays constant
+regardless of input size.
+
+    python -m src data/restaurant-reviews.csv --analyzer lexicon --output results.jsonl
+    python -m src reviews.jsonl --analyzer transformer --text-field text --workers 4
+"""
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from dataclasses import asdict
+from typing import Iterable, Iterator, Optional, TextIO
+
+from src.reviews import read_reviews
+from src.runner import ANALYZERS, load_analyzer, run_corpus
+
+
+class Progress:
+    """Reviews/aspects processed and throughput, redrawn on stderr at most every interval seconds"""
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = 1.0, enabled: bool = True):
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.enabled = enabled
+        self.reviews = 0
+        self.aspects = 0
+        self.start = time.perf_counter()
+        self._last = self.start
+
+    def update(self, aspects: int) -> None:
+        self.reviews += 1
+        self.aspects += aspects
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._draw(now, end='\r')
+
+    def close(self) -> None:
+        self._draw(time.perf_counter(), end='\n')
+
+    def _draw(self, now: float, end: str) -> None:
+        if not self.enabled:
+            return
+        elapsed = now - self.start
+        rate = self.reviews / elapsed if elapsed > 0 else 0.0
+        self.stream.write(f"{self.reviews} reviews, {self.aspects} aspects, "
+                          f"{elapsed:.1f}s, {rate:.1f} reviews/s{end}")
+        self.stream.flush()
+
+
+def _remember(texts: Iterable[str], buffer: deque) -> Iterator[str]:
+    for text in texts:
+        buffer.append(text)
+        yield text
+
+
+def write_results(results: Iterable, out: TextIO, progress: Progress,
+                  texts: Optional[deque] = None) -> None:
+    """
+    Write one JSON line per review as results arrive.
+
+    texts, if given, is filled with the reviews as the analyzer reads them; it only
+    ever holds the reviews currently buffered by the analyzer.
+    """
+    for i, aspects in enumerate(results):
+        record = {'id': i}
+        if texts is not None:
+            record['text'] = texts.popleft()
+        record['aspects'] = [asdict(aspect) for aspect in aspects]
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        progress.update(len(aspects))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m src',
+                                     description="Stream reviews from CSV/JSONL through an ABSA analyzer into JSONL.")
+    parser.add_argument('input', help="CSV or JSONL file, or '-' for stdin")
+    parser.add_argument('--analyzer', default='lexicon',
+                        help=f"One of {', '.join(ANALYZERS)} or a 'module:Class' spec (default: lexicon)")
+    parser.add_argument('--output', '-o', default='-', help="JSONL output file (default: stdout)")
+    parser.add_argument('--format', choices=['auto', 'csv', 'jsonl'], default='auto')
+    parser.add_argument('--text-column', default='Review Text', help="CSV column holding the review")
+    parser.add_argument('--text-field', default='text', help="JSONL field holding the review")
+    parser.add_argument('--include-text', action='store_true', help="Copy the review text into each output line")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (see src.runner)")
+    parser.add_argument('--torch-threads', type=int, default=1,
+                        help="torch intra-op threads per worker (default: 1; 0 leaves torch's default)")
+    parser.add_argument('--kwargs', default='{}', help="JSON constructor arguments for the analyzer")
+    parser.add_argument('--quiet', '-q', action='store_true', help="No progress output")
+    args = parser.parse_args(argv)
+
+    analyzer_kwargs = json.loads(args.kwargs)
+
+    reviews = read_reviews(args.input, args.format, args.text_column, args.text_field)
+    texts = None
+    if args.include_text:
+        texts = deque()
+        reviews = _remember(reviews, texts)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    progress = Progress(enabled=not args.quiet)
+    try:
+        if args.workers > 1:
+            results = run_corpus(args.analyzer, reviews, workers=args.workers,
+                                 chunk_size=args.batch_size, torch_threads=args.torch_threads,
+                                 analyzer_kwargs=analyzer_kwargs)
+        else:
+            analyzer = load_analyzer(args.analyzer, analyzer_kwargs)
+            results = analyzer.analyze_stream(reviews, batch_size=args.batch_size)
+
+        write_results(results, out, progress, texts)
+    finally:
+        progress.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
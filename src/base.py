@@ -1,12 +1,20 @@
+import inspect
+import json
+import logging
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterable, Iterator
 from abc import ABC, abstractmethod
-import time
-import sys
+
 import numpy as np
 
+from src.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from src.metrics import CorpusRecording, MemoryProfiler, MetricsCollector
+from src.startup import DEFAULT_SAMPLE_TEXT, profile_startup
+
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class AspectSentiment:
     """Data class for aspect-sentiment pairs"""
     aspect: str
@@ -18,7 +26,145 @@ class AspectSentiment:
         return f"Aspect: '{self.aspect}' → Sentiment: {self.sentiment.upper()} (confidence: {self.confidence:.2f})"
 
 
+class ResultBatch:
+    """
+    Columnar storage for the results of many reviews.
+
+    One row per aspect, held in NumPy arrays: review index, aspect code, sentiment
+    code, confidence and span start/end (-1 where there is no span). Aspect and
+    sentiment strings are interned into tables that the codes index, so repeated
+    aspects ("food", "service") are stored once. Rows are ordered by review.
+    """
+
+    SENTIMENTS = ('negative', 'neutral', 'positive')
+
+    def __init__(self, review_index: np.ndarray, aspect_codes: np.ndarray, sentiment_codes: np.ndarray,
+                 confidence: np.ndarray, span_start: np.ndarray, span_end: np.ndarray,
+                 aspects: List[str], sentiments: List[str], n_reviews: int):
+        self.review_index = review_index
+        self.aspect_codes = aspect_codes
+        self.sentiment_codes = sentiment_codes
+        self.confidence = confidence
+        self.span_start = span_start
+        self.span_end = span_end
+        self.aspects = aspects
+        self.sentiments = sentiments
+        self.n_reviews = n_reviews
+
+    @classmethod
+    def from_results(cls, results: Iterable[List[AspectSentiment]]) -> 'ResultBatch':
+        """Build a batch from per-review result lists (e.g. analyze_stream output), consumed lazily."""
+        review_index = []
+        aspect_codes = []
+        sentiment_codes = []
+        confidence = []
+        span_start = []
+        span_end = []
+        aspect_table: Dict[str, int] = {}
+        sentiment_table: Dict[str, int] = {label: code for code, label in enumerate(cls.SENTIMENTS)}
+
+        n_reviews = 0
+        for n_reviews, review in enumerate(results, start=1):
+            for result in review:
+                review_index.append(n_reviews - 1)
+                aspect_codes.append(aspect_table.setdefault(result.aspect, len(aspect_table)))
+                sentiment_codes.append(sentiment_table.setdefault(result.sentiment, len(sentiment_table)))
+                confidence.append(result.confidence)
+                start, end = result.text_span if result.text_span is not None else (-1, -1)
+                span_start.append(start)
+                span_end.append(end)
+
+        return cls(
+            review_index=np.array(review_index, dtype=np.int64),
+            aspect_codes=np.array(aspect_codes, dtype=np.int32),
+            sentiment_codes=np.array(sentiment_codes, dtype=np.int8),
+            confidence=np.array(confidence, dtype=np.float64),
+            span_start=np.array(span_start, dtype=np.int32),
+            span_end=np.array(span_end, dtype=np.int32),
+            aspects=list(aspect_table),
+            sentiments=list(sentiment_table),
+            n_reviews=n_reviews
+        )
+
+    def __len__(self) -> int:
+        return len(self.review_index)
+
+    def _row(self, i: int) -> AspectSentiment:
+        start = int(self.span_start[i])
+        return AspectSentiment(
+            aspect=self.aspects[self.aspect_codes[i]],
+            sentiment=self.sentiments[self.sentiment_codes[i]],
+            confidence=float(self.confidence[i]),
+            text_span=(start, int(self.span_end[i])) if start >= 0 else None
+        )
+
+    def __iter__(self) -> Iterator[AspectSentiment]:
+        """Yield every aspect as an AspectSentiment, in review order."""
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def review(self, index: int) -> List[AspectSentiment]:
+        """Results of one review, as analyze() would have returned them."""
+        if not 0 <= index < self.n_reviews:
+            raise IndexError(f"review index {index} out of range for {self.n_reviews} reviews")
+        lo, hi = np.searchsorted(self.review_index, [index, index + 1])
+        return [self._row(i) for i in range(lo, hi)]
+
+    def iter_reviews(self) -> Iterator[List[AspectSentiment]]:
+        """Yield one result list per review, including empty ones."""
+        bounds = np.searchsorted(self.review_index, np.arange(self.n_reviews + 1))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            yield [self._row(i) for i in range(lo, hi)]
+
+    def to_dataframe(self):
+        """
+        One row per aspect with columns review, aspect, sentiment, confidence,
+        span_start and span_end. Aspect and sentiment are pandas categoricals
+        sharing the interned tables, so no strings are copied per row.
+        """
+        import pandas as pd
+
+        return pd.DataFrame({
+            'review': self.review_index,
+            'aspect': pd.Categorical.from_codes(self.aspect_codes, categories=self.aspects),
+            'sentiment': pd.Categorical.from_codes(self.sentiment_codes, categories=self.sentiments),
+            'confidence': self.confidence,
+            'span_start': self.span_start,
+            'span_end': self.span_end
+        })
+
+
 class ABSAAnalyzer(ABC):
+    # Stage timers/counters sink; a no-op unless instrument() attaches a recorder
+    instrumentation: Instrumentation = NULL_INSTRUMENTATION
+
+    def __new__(cls, *args, **kwargs):
+        instance = super().__new__(cls)
+        # Constructor arguments by name, so startup profiling rebuilds the same configuration
+        try:
+            bound = inspect.signature(cls.__init__).bind_partial(instance, *args, **kwargs)
+            instance._init_kwargs = {name: value for name, value in list(bound.arguments.items())[1:]}
+        except TypeError:  # mismatched arguments; __init__ reports them
+            instance._init_kwargs = dict(kwargs)
+        return instance
+
+    def init_kwargs(self) -> Dict:
+        """
+        The JSON-serializable constructor arguments of this instance. Others
+        (e.g. a shared spaCy pipeline or tier instances) cannot be recreated in
+        another process and are left out with a warning.
+        """
+        kwargs = {}
+        for name, value in getattr(self, '_init_kwargs', {}).items():
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                logger.warning("%s: constructor argument %r is not JSON-serializable; "
+                               "startup is profiled without it", self.__class__.__name__, name)
+                continue
+            kwargs[name] = value
+        return kwargs
+
     @abstractmethod
     def analyze(self, text: str) -> List[AspectSentiment]:
         """
@@ -32,123 +178,166 @@ class ABSAAnalyzer(ABC):
         """
         pass
 
-    # ==================== PERFORMANCE METRICS ====================
+    def analyze_stream(self, texts: Iterable[str], batch_size: int = 64,
+                       n_process: int = 1) -> Iterator[List[AspectSentiment]]:
+        """
+        Lazily analyze an iterable of texts, yielding one result list per text in input order.
+
+        Subclasses with a batched backend (e.g. spaCy ``nlp.pipe``) override this;
+        the default simply calls ``analyze`` for each text.
+
+        Args:
+            texts: Iterable of input texts (consumed lazily)
+            batch_size: Number of texts buffered per batch by batched backends
+            n_process: Number of worker processes used by batched backends
 
-    def calculate_speed(self, texts: List[str]) -> Dict[str, float]:
-        """Calculate processing speed metrics for the model."""
-        if not texts:
-            return {
-                'total_time': 0.0,
-                'avg_time_per_text': 0.0,
-                'throughput_texts_per_second': 0.0,
-                'texts_processed': 0
-            }
-
-        start_time = time.time()
+        Yields:
+            List of AspectSentiment objects for each text
+        """
         for text in texts:
-            self.analyze(text)
-        total_time = time.time() - start_time
+            yield self.analyze(text)
+
+    def analyze_batch(self, texts: Iterable[str], batch_size: int = 64,
+                      n_process: int = 1) -> List[List[AspectSentiment]]:
+        """
+        Analyze many texts at once.
+
+        Args:
+            texts: Input texts to analyze
+            batch_size: Number of texts buffered per batch by batched backends
+            n_process: Number of worker processes used by batched backends
+
+        Returns:
+            One list of AspectSentiment objects per input text, in input order
+        """
+        return list(self.analyze_stream(texts, batch_size=batch_size, n_process=n_process))
+
+    def analyze_columnar(self, texts: Iterable[str], batch_size: int = 64,
+                         n_process: int = 1) -> ResultBatch:
+        """
+        Analyze many texts into a compact columnar ResultBatch.
+
+        Args:
+            texts: Input texts to analyze
+            batch_size: Number of texts buffered per batch by batched backends
+            n_process: Number of worker processes used by batched backends
+
+        Returns:
+            ResultBatch with one row per extracted aspect
+        """
+        return ResultBatch.from_results(self.analyze_stream(texts, batch_size=batch_size, n_process=n_process))
+
+    def instrument(self, instrumentation: Optional[Instrumentation] = None) -> Instrumentation:
+        """
+        Attach an instrumentation sink (e.g. StageRecorder) to this analyzer.
+
+        Args:
+            instrumentation: Sink to report stage timings and counters to; None detaches
+
+        Returns:
+            The attached sink
+        """
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        return self.instrumentation
+
+    # ==================== PERFORMANCE METRICS ====================
+
+    def record_corpus(self, texts: List[str], profile_memory: bool = False,
+                      warmup: int = 0, repeat: int = 1) -> CorpusRecording:
+        """
+        Run the model over texts, recording timing, aspect counts,
+        confidences and memory for every call.
+
+        Args:
+            texts: List of text strings to analyze
+            profile_memory: Trace allocations and RSS in an extra untimed pass
+            warmup: Untimed calls before measuring, so one-off first-call costs are excluded
+            repeat: Timed passes over the corpus; per-text latency is the median over passes
+
+        Returns:
+            CorpusRecording from which every metrics section can be computed
+        """
+        return MetricsCollector(self, profile_memory=profile_memory,
+                                warmup=warmup, repeat=repeat).record(texts)
 
-        return {
-            'total_time': total_time,
-            'avg_time_per_text': total_time / len(texts),
-            'throughput_texts_per_second': len(texts) / total_time if total_time > 0 else 0.0,
-            'texts_processed': len(texts)
-        }
+    def calculate_speed(self, texts: List[str], warmup: int = 1, repeat: int = 1) -> Dict[str, float]:
+        """
+        Calculate processing speed metrics for the model: throughput, per-text
+        latency percentiles with 95% confidence intervals and latency by review length.
+
+        Args:
+            texts: List of text strings to analyze
+            warmup: Untimed calls before measuring
+            repeat: Timed passes over the corpus
+        """
+        return self.record_corpus(texts, warmup=warmup, repeat=repeat).speed()
 
     def calculate_aspects_detected(self, texts: List[str]) -> Dict[str, float]:
         """Calculate statistics on number of aspects detected."""
-        aspect_counts = [len(self.analyze(text)) for text in texts]
-
-        if not aspect_counts:
-            return {
-                'mean': 0.0,
-                'median': 0.0,
-                'std': 0.0,
-                'min': 0,
-                'max': 0,
-                'total': 0
-            }
-
-        return {
-            'mean': float(np.mean(aspect_counts)),
-            'median': float(np.median(aspect_counts)),
-            'std': float(np.std(aspect_counts)),
-            'min': int(min(aspect_counts)),
-            'max': int(max(aspect_counts)),
-            'total': int(sum(aspect_counts))
-        }
+        return self.record_corpus(texts).aspects_detected()
 
     def calculate_avg_confidence(self, texts: List[str]) -> Dict[str, float]:
         """Calculate confidence score statistics."""
-        confidences = []
-        for text in texts:
-            results = self.analyze(text)
-            confidences.extend([r.confidence for r in results])
-
-        if not confidences:
-            return {
-                'avg': 0.0,
-                'min': 0.0,
-                'max': 0.0,
-                'std': 0.0,
-                'total_aspects': 0
-            }
-
-        return {
-            'avg': float(np.mean(confidences)),
-            'min': float(min(confidences)),
-            'max': float(max(confidences)),
-            'std': float(np.std(confidences)),
-            'total_aspects': len(confidences)
-        }
+        return self.record_corpus(texts).avg_confidence()
 
     def calculate_memory_usage(self, texts: List[str]) -> Dict[str, float]:
         """
-        Calculate memory usage metrics.
-        Override in subclass for model-specific memory tracking.
+        Calculate memory usage metrics: peak traced Python allocations, process
+        RSS and its high-water mark, per-stage allocation deltas and the model
+        footprint where the analyzer exposes model_footprint().
         """
-        import gc
-        gc.collect()
+        return MemoryProfiler(self).profile(texts)
 
-        memory_samples = []
-        for text in texts:
-            results = self.analyze(text)
-            results_size = sys.getsizeof(results) / (1024 * 1024)  # Convert to MB
-            memory_samples.append(results_size)
+    def calculate_startup_profile(self, sample_text: str = DEFAULT_SAMPLE_TEXT,
+                                  warm: bool = True) -> Dict[str, Dict]:
+        """
+        Break startup cost down into import time, per-component load time,
+        first-inference latency and steady-state latency.
 
-        return {
-            'peak_memory_mb': float(max(memory_samples)) if memory_samples else 0.0,
-            'avg_memory_per_text_mb': float(np.mean(memory_samples)) if memory_samples else 0.0,
-            'total_memory_mb': float(sum(memory_samples)) if memory_samples else 0.0
-        }
+        Cold numbers come from a fresh subprocess constructing the analyzer with
+        the same constructor arguments as this instance (see init_kwargs); warm
+        numbers from a second instance in this process.
 
-    def calculate_initialization_time(self) -> float:
-        """
-        Calculate model initialization time.
-        Override in subclass for more accurate model-specific timing.
+        Args:
+            sample_text: Text used for first-inference and steady-state timing
+            warm: Also measure a warm (in-process) construction
+
+        Returns:
+            {'cold': {...}, 'warm': {...}} startup breakdowns
         """
-        start = time.time()
-        _ = self.__class__()
-        return time.time() - start
+        cls = self.__class__
+        return profile_startup(cls.__module__, cls.__qualname__, sample_text,
+                               analyzer_kwargs=self.init_kwargs(), warm=warm)
+
+    def calculate_initialization_time(self) -> float:
+        """Cold construction time in seconds, measured in a fresh subprocess."""
+        return self.calculate_startup_profile(warm=False)['cold']['init_seconds']
 
-    def calculate_all_metrics(self, texts: List[str]) -> Dict[str, Dict]:
+    def calculate_all_metrics(self, texts: List[str], include_initialization: bool = True,
+                              recording: Optional[CorpusRecording] = None,
+                              profile_memory: bool = False, warmup: int = 0,
+                              repeat: int = 1) -> Dict[str, Dict]:
         """
-        Calculate all performance metrics at once.
+        Calculate all performance metrics from a single pass over the corpus.
 
         Args:
             texts: List of text strings to analyze
+            include_initialization: Also profile cold startup in a fresh subprocess
+            recording: Previously saved recording to report on instead of running inference
+            profile_memory: Report traced/RSS memory, measured in an extra untimed pass
+            warmup: Untimed calls before measuring
+            repeat: Timed passes over the corpus (per-text latency is the median over passes)
 
         Returns:
             Dictionary containing all metrics organized by category
         """
-        return {
-            'speed': self.calculate_speed(texts),
-            'aspects_detected': self.calculate_aspects_detected(texts),
-            'avg_confidence': self.calculate_avg_confidence(texts),
-            'memory_usage': self.calculate_memory_usage(texts),
-            'initialization': {'time_seconds': self.calculate_initialization_time()}
-        }
+        if recording is None:
+            recording = self.record_corpus(texts, profile_memory=profile_memory,
+                                           warmup=warmup, repeat=repeat)
+        if include_initialization and recording.startup is None:
+            recording.startup = self.calculate_startup_profile(warm=False)['cold']
+
+        return recording.report()
 
     def print_metrics_report(self, metrics: Dict[str, Dict]) -> None:
         """
@@ -165,6 +354,15 @@ class ABSAAnalyzer(ABC):
         print(f"  Total time: {metrics['speed']['total_time']:.4f}s")
         print(f"  Avg time per text: {metrics['speed']['avg_time_per_text']:.4f}s")
         print(f"  Throughput: {metrics['speed']['throughput_texts_per_second']:.2f} texts/sec")
+        if 'p50_latency' in metrics['speed']:
+            speed = metrics['speed']
+            print(f"  Latency p50/p90/p99/max: {speed['p50_latency']:.4f}s / {speed['p90_latency']:.4f}s / "
+                  f"{speed['p99_latency']:.4f}s / {speed['max_latency']:.4f}s")
+            low, high = speed['mean_latency_ci95']
+            print(f"  Mean latency 95% CI: [{low:.4f}s, {high:.4f}s] "
+                  f"(warm-up {speed['warmup']}, {speed['repeat']} run(s))")
+            if speed['by_length']['per_word_seconds'] is not None:
+                print(f"  Per-word cost: {speed['by_length']['per_word_seconds'] * 1000:.4f} ms/word")
 
         print("\n ASPECTS DETECTED")
         print(f"  Mean: {metrics['aspects_detected']['mean']:.2f}")
@@ -179,10 +377,37 @@ class ABSAAnalyzer(ABC):
         print(f"  Std Dev: {metrics['avg_confidence']['std']:.4f}")
 
         print("\n MEMORY USAGE")
-        print(f"  Peak memory: {metrics['memory_usage']['peak_memory_mb']:.4f} MB")
-        print(f"  Avg per text: {metrics['memory_usage']['avg_memory_per_text_mb']:.4f} MB")
+        memory = metrics['memory_usage']
+        if memory is None:
+            print("  Not profiled (pass profile_memory=True)")
+        else:
+            print(f"  Peak traced memory: {memory['peak_memory_mb']:.4f} MB")
+            print(f"  Avg per text: {memory['avg_memory_per_text_mb']:.4f} MB")
+            if memory.get('rss_delta_mb') is not None:
+                print(f"  RSS increase during the run: {memory['rss_delta_mb']:.1f} MB")
+            if memory.get('rss_lifetime_peak_mb') is not None:
+                print(f"  RSS high-water mark (process lifetime, incl. model loading): "
+                      f"{memory['rss_lifetime_peak_mb']:.1f} MB")
+            for stage, stats in memory.get('stages', {}).items():
+                print(f"  Stage '{stage}': peak {stats['peak_mb']:.4f} MB, avg net {stats['avg_net_mb']:.4f} MB")
+            if 'model' in memory:
+                model = memory['model']
+                if 'weights_mb' in model:
+                    print(f"  Model ({model['backend']}): {model['weights_mb']:.1f} MB weights, "
+                          f"{model['buffers_mb']:.1f} MB buffers")
+                elif 'file_mb' in model:
+                    print(f"  Model ({model['backend']}): {model['file_mb']:.1f} MB graph file")
+                else:
+                    print(f"  Model: {model['parameters_mb']:.1f} MB parameters, {model['buffers_mb']:.1f} MB buffers")
 
         print("\n⚡ INITIALIZATION")
         print(f"  Time: {metrics['initialization']['time_seconds']:.4f}s")
+        if 'import_seconds' in metrics['initialization']:
+            startup = metrics['initialization']
+            print(f"  Import: {startup['import_seconds']:.4f}s")
+            for component, seconds in startup['components'].items():
+                print(f"  Load {component}: {seconds:.4f}s")
+            print(f"  First inference: {startup['first_inference_seconds']:.4f}s")
+            print(f"  Steady-state inference: {startup['steady_state_seconds']:.4f}s")
 
         print("\n" + "=" * 60)
\ No newline at end of file
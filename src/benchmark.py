@@ -0,0 +1,300 @@
+"""
+Micro-benchmarks for the aspect extraction and sentiment hot paths.
+
+Inputs are taken from the bundled reviews at several corpus sizes. Results can
+be saved as a JSON baseline and later compared against it; a case is flagged as
+a regression when its median time grows by more than the tolerance. Everything
+runs offline: the transformer cases are skipped unless the model is already in
+the local Hugging Face cache, and so are the lexicon cases without a spaCy model.
+The transformer suite runs once per inference backend (fp32, int8, onnx); the
+onnx one is skipped without onnxruntime.
+
+    python -m src.benchmark --save benchmarks/baseline.json
+    python -m src.benchmark --compare benchmarks/baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.reviews import read_reviews
+from src.evaluation import load_gold
+from src.startup import PROJECT_ROOT
+
+DEFAULT_REVIEWS_PATH = os.path.join(PROJECT_ROOT, 'data', 'restaurant-reviews.csv')
+DEFAULT_GOLD_PATH = os.path.join(PROJECT_ROOT, 'data', 'tests.json')
+
+# Number of reviews per corpus size; None takes the whole file
+SIZES = {'small': 10, 'medium': 35, 'full': None}
+
+
+@dataclass
+class BenchmarkCase:
+    """A timed callable over a fixed input; reset runs untimed before every repetition"""
+    name: str
+    run: Callable[[], object]
+    items: int
+    reset: Optional[Callable[[], None]] = None
+
+
+def time_case(case: BenchmarkCase, repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Median and minimum wall time of a case over repeat runs, after warmup runs."""
+    timings = []
+    for run in range(warmup + repeat):
+        if case.reset is not None:
+            case.reset()
+        start = time.perf_counter()
+        case.run()
+        elapsed = time.perf_counter() - start
+        if run >= warmup:
+            timings.append(elapsed)
+
+    median = statistics.median(timings)
+    return {
+        'items': case.items,
+        'repeat': repeat,
+        'median_seconds': median,
+        'min_seconds': min(timings),
+        'per_item_us': median / case.items * 1e6 if case.items else 0.0
+    }
+
+
+def lexicon_cases(analyzer, texts: List[str]) -> List[BenchmarkCase]:
+    """Cases for the shared spaCy extraction pipeline and the lexicon sentiment path."""
+    docs = list(analyzer._parse_stream(texts))
+    extracted = [(analyzer._extract_aspects(doc), doc) for doc in docs]
+    candidates = [(analyzer._get_candidate_aspects(doc), doc) for doc in docs]
+    n_candidates = sum(len(aspects) for aspects, _ in candidates)
+    spans = [span for spans, _ in extracted for span in spans]
+    span_texts = [analyzer._get_text(span) for span in spans]
+    tokens = [token for doc in docs for token in doc]
+    sentences = [sent.text.strip() for doc in docs for sent in doc.sents]
+
+    return [
+        BenchmarkCase('spacy_parse', lambda: list(analyzer._parse_stream(texts)), len(texts)),
+        BenchmarkCase('normalize_aspect', lambda: [analyzer._normalize_aspect(t) for t in span_texts],
+                      len(span_texts), reset=analyzer.normalizer.cache_clear),
+        BenchmarkCase('normalize_aspect_cached', lambda: [analyzer._normalize_aspect(t) for t in span_texts],
+                      len(span_texts)),
+        BenchmarkCase('is_valid_aspect', lambda: [analyzer._is_valid_aspect(s) for s in spans], len(spans)),
+        BenchmarkCase('extract_aspects', lambda: [analyzer._extract_aspects(doc) for doc in docs], len(docs)),
+        BenchmarkCase('merge_coordinated_aspects',
+                      lambda: [analyzer._merge_coordinated_aspects(a, doc, doc.text) for a, doc in extracted],
+                      len(extracted)),
+        BenchmarkCase('get_aspect_sentiment',
+                      lambda: [analyzer._get_aspect_sentiments(aspects, doc) for aspects, doc in candidates],
+                      n_candidates),
+        BenchmarkCase('vader_polarity_scores', lambda: [analyzer.vader.polarity_scores(t) for t in sentences],
+                      len(sentences)),
+        BenchmarkCase('valence_compound', lambda: [analyzer.valence.compound(t) for t in sentences],
+                      len(sentences)),
+        BenchmarkCase('check_negation', lambda: [analyzer._check_negation(t, scope) for doc in docs
+                                                 for scope in [analyzer._compute_negation_scope(doc)]
+                                                 for t in doc], len(tokens)),
+    ]
+
+
+def tree_walk_negation(token) -> bool:
+    """Per-token negation check by walking the dependency tree (the pre-computed scopes' reference)."""
+    negation_words = {'no', 'not', "n't", 'never', 'none'}
+    for child in token.children:
+        if child.dep_ == 'neg' or child.lower_ in negation_words:
+            return True
+
+    for anc in token.ancestors:
+        for c in anc.children:
+            if c.dep_ == 'neg' or c.lower_ in negation_words:
+                return True
+
+    doc = token.doc
+    for i in range(max(0, token.i - 4), token.i):
+        if doc[i].lower_ in negation_words:
+            return True
+
+    return False
+
+
+def longest_gold_reviews(n: int, path: str = DEFAULT_GOLD_PATH) -> List[str]:
+    """The n longest review texts of a gold file."""
+    return sorted((entry['text'] for entry in load_gold(path)), key=len, reverse=True)[:n]
+
+
+def negation_cases(analyzer, texts: List[str]) -> List[BenchmarkCase]:
+    """
+    Negation checks for every candidate aspect of the longest gold reviews (as many
+    as there are texts), per-aspect tree walks against scopes computed once per Doc.
+    """
+    docs = list(analyzer._parse_stream(longest_gold_reviews(len(texts))))
+    roots_by_doc = [(doc, [analyzer._get_root(aspect) for aspect in analyzer._get_candidate_aspects(doc)])
+                    for doc in docs]
+    roots = [t for _, doc_roots in roots_by_doc for t in doc_roots]
+
+    return [
+        BenchmarkCase('negation_tree_walk', lambda: [tree_walk_negation(t) for t in roots], len(roots)),
+        BenchmarkCase('negation_scope', lambda: [analyzer._check_negation(t, scope) for doc, doc_roots in roots_by_doc
+                                                 for scope in [analyzer._compute_negation_scope(doc)]
+                                                 for t in doc_roots], len(roots)),
+    ]
+
+
+def transformer_cases(analyzer, texts: List[str]) -> List[BenchmarkCase]:
+    """
+    Pair tokenization (per-pair tokenizer calls against reviews encoded once) and
+    aspect sentiment classification with an empty cache, one (review, aspect) pair
+    at a time and as one batched call. Cases are suffixed with the backend unless it is fp32.
+    """
+    pairs = [(doc.text, analyzer._normalize_aspect(analyzer._get_text(aspect)))
+             for doc in analyzer._parse_stream(texts)
+             for aspect in analyzer._get_candidate_aspects(doc)]
+    suffix = '' if analyzer.backend.name == 'fp32' else f"_{analyzer.backend.name}"
+
+    return [
+        BenchmarkCase(f'tokenize_pairs{suffix}',
+                      lambda: [analyzer.tokenizer(text, aspect, truncation=True, max_length=analyzer.max_length)
+                               for text, aspect in pairs], len(pairs)),
+        BenchmarkCase(f'encode_pairs{suffix}', lambda: analyzer._encode_pairs(pairs), len(pairs),
+                      reset=analyzer.token_cache.clear),
+        BenchmarkCase(f'classify_aspect_sentiment{suffix}',
+                      lambda: [analyzer._classify_aspect_sentiment(text, aspect) for text, aspect in pairs],
+                      len(pairs), reset=analyzer.cache.clear),
+        BenchmarkCase(f'classify_pairs{suffix}', lambda: analyzer._classify_pairs(pairs),
+                      len(pairs), reset=analyzer.cache.clear),
+    ]
+
+
+def _load(factory: Callable[[], object]):
+    """Build an analyzer offline; returns (analyzer, None) or (None, reason it is unavailable)."""
+    try:
+        return factory(), None
+    except Exception as e:  # missing package, spaCy model or uncached weights
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _lexicon():
+    from src.lexicon_absa import LexiconABSA
+    return LexiconABSA()
+
+
+def _transformer(backend: str = 'fp32'):
+    from src.transformer_absa import TransformerABSA
+    # Never reach out to the Hugging Face hub: use cached weights or skip
+    return TransformerABSA(backend=backend, local_files_only=True)
+
+
+SUITES = {
+    'lexicon': (_lexicon, lexicon_cases),
+    'negation': (_lexicon, negation_cases),
+    'transformer': (_transformer, transformer_cases),
+    'transformer_int8': (lambda: _transformer('int8'), transformer_cases),
+    'transformer_onnx': (lambda: _transformer('onnx'), transformer_cases),
+}
+
+
+def run_benchmarks(suites: Optional[List[str]] = None, sizes: Optional[List[str]] = None,
+                   repeat: int = 5, warmup: int = 1, reviews_path: str = DEFAULT_REVIEWS_PATH) -> Dict:
+    """
+    Run the benchmark suites at each corpus size.
+
+    Returns:
+        {'meta': {...}, 'results': {case: {size: timing}}, 'skipped': {suite: reason}}
+    """
+    reviews = list(read_reviews(reviews_path))
+    sizes = sizes or list(SIZES)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'repeat': repeat,
+            'sizes': {size: len(reviews[:SIZES[size]]) for size in sizes}
+        },
+        'results': {},
+        'skipped': {}
+    }
+
+    for suite in suites or list(SUITES):
+        factory, make_cases = SUITES[suite]
+        analyzer, reason = _load(factory)
+        if analyzer is None:
+            report['skipped'][suite] = reason
+            continue
+
+        for size in sizes:
+            texts = reviews[:SIZES[size]]
+            for case in make_cases(analyzer, texts):
+                report['results'].setdefault(case.name, {})[size] = time_case(case, repeat, warmup)
+
+    return report
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.2) -> List[Dict]:
+    """
+    Compare median times of the cases present in both reports.
+
+    Returns:
+        One entry per case and size with the time ratio (current / baseline) and
+        whether it exceeds 1 + tolerance
+    """
+    rows = []
+    for name, by_size in current['results'].items():
+        for size, timing in by_size.items():
+            base = baseline.get('results', {}).get(name, {}).get(size)
+            if base is None or base['median_seconds'] <= 0:
+                continue
+            ratio = timing['median_seconds'] / base['median_seconds']
+            rows.append({
+                'case': name,
+                'size': size,
+                'baseline_seconds': base['median_seconds'],
+                'current_seconds': timing['median_seconds'],
+                'ratio': ratio,
+                'regression': ratio > 1 + tolerance
+            })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the extraction and sentiment hot paths.")
+    parser.add_argument('--suite', action='append', choices=list(SUITES), help="Repeatable (default: all)")
+    parser.add_argument('--size', action='append', choices=list(SIZES), help="Repeatable (default: all)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--reviews', default=DEFAULT_REVIEWS_PATH)
+    parser.add_argument('--save', help="Write the results to this JSON baseline")
+    parser.add_argument('--compare', help="Compare against this JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.suite, args.size, args.repeat, args.warmup, args.reviews)
+
+    for suite, reason in report['skipped'].items():
+        print(f"skipped {suite}: {reason}")
+    for name, by_size in report['results'].items():
+        for size, timing in by_size.items():
+            print(f"{name:<28} {size:<7} {timing['median_seconds'] * 1000:10.3f} ms "
+                  f"{timing['per_item_us']:10.2f} us/item")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            rows = compare(report, json.load(f), args.tolerance)
+        for row in rows:
+            flag = 'REGRESSION' if row['regression'] else 'ok'
+            print(f"{row['case']:<28} {row['size']:<7} x{row['ratio']:.2f} {flag}")
+        if any(row['regression'] for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: str) -> str:
+    """Stable hex key for an ordered tuple of strings (e.g. model name, text, aspect)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Size-bounded in-memory least-recently-used cache with hit/miss counters"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._data),
+            'maxsize': self.maxsize
+        }
+
+
+class SQLiteCache:
+    """
+    On-disk key/value store for JSON-serializable values.
+
+    Entries are evicted least-recently-used first once more than max_entries
+    are stored, and expire ttl_seconds after they were written. A read-only
+    cache never writes (not even access times), which keeps benchmark runs
+    reproducible. Safe to share between threads of one process, and between
+    processes (e.g. run_corpus workers) pointing at the same file.
+
+    Hits do not write: access times are buffered and written together with the
+    next put, or once flush_every of them have accumulated. put_many stores a
+    batch in one transaction. Lock contention and other database errors are
+    logged and degrade to a cache miss / an unsaved entry / an uncleared cache;
+    a read-only cache whose file cannot be opened is empty.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = 100000,
+                 ttl_seconds: Optional[float] = None, read_only: bool = False,
+                 timeout: float = 30.0, flush_every: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.read_only = read_only
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}  # key -> access time not yet written
+        if read_only:
+            try:
+                self._conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, timeout=timeout,
+                                             check_same_thread=False)
+            except sqlite3.OperationalError as e:
+                # Nothing to replay (e.g. no such file): an empty cache, without creating the file
+                logger.warning("Cache %s could not be opened read-only: %s", path, e)
+                self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+                self._create_table()
+        else:
+            self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+            self._create_table()
+
+    def _create_table(self) -> None:
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)')
+        self._conn.commit()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            try:
+                row = self._conn.execute('SELECT value, created_at FROM cache WHERE key = ?', (key,)).fetchone()
+            except sqlite3.OperationalError as e:
+                logger.warning("Cache read from %s failed: %s", self.path, e)
+                row = None
+            now = time.time()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                # Left for put's eviction or a later overwrite; expired rows are never served
+                row = None
+            if row is None:
+                self.misses += 1
+                return default
+            if not self.read_only:
+                self._accessed[key] = now
+                if len(self._accessed) >= self.flush_every:
+                    self._write([])
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items) -> None:
+        """Store (key, value) pairs in a single transaction."""
+        if self.read_only:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(value), now, now) for key, value in items]
+        with self._lock:
+            self._write(rows)
+
+    def flush(self) -> None:
+        """Write buffered access times."""
+        if self.read_only:
+            return
+        with self._lock:
+            if self._accessed:
+                self._write([])
+
+    def _write(self, rows) -> None:
+        # One transaction: buffered access times, new rows and eviction. The
+        # entry count is read from the file, so writes by other processes count.
+        accessed = list(self._accessed.items())
+        self._accessed = {}
+        try:
+            with self._conn:
+                self._conn.executemany('UPDATE cache SET accessed_at = ? WHERE key = ?',
+                                       [(t, key) for key, t in accessed])
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)', rows
+                )
+                if rows and self.ttl_seconds is not None:
+                    self._conn.execute('DELETE FROM cache WHERE created_at < ?', (time.time() - self.ttl_seconds,))
+                if rows and self.max_entries is not None:
+                    excess = self._count() - self.max_entries
+                    if excess > 0:
+                        self._conn.execute(
+                            'DELETE FROM cache WHERE key IN ('
+                            'SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)',
+                            (excess,)
+                        )
+        except sqlite3.OperationalError as e:
+            logger.warning("Cache write to %s failed: %s", self.path, e)
+
+    def _count(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def clear(self) -> None:
+        if self.read_only:
+            return
+        with self._lock:
+            self._accessed = {}
+            try:
+                with self._conn:
+                    self._conn.execute('DELETE FROM cache')
+            except sqlite3.OperationalError as e:
+                logger.warning("Cache clear of %s failed: %s", self.path, e)
+                return
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            try:
+                return self._count()
+            except sqlite3.OperationalError:
+                return 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self),
+            'maxsize': self.max_entries
+        }
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional on-disk store; disk hits are promoted to memory."""
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str, default=None):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+                return value
+        return default
+
+    def put(self, key: str, value: Any) -> None:
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def put_many(self, items) -> None:
+        """Store (key, value) pairs; the disk tier writes them in one transaction."""
+        items = list(items)
+        for key, value in items:
+            self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put_many(items)
+
+    def flush(self) -> None:
+        if self.disk is not None:
+            self.disk.flush()
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {'memory': self.memory.stats()}
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats()
+        return stats
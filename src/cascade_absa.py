@@ -0,0 +1,190 @@
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+import sys
+
+sys.path.insert(0, '.')
+from src.base import ABSAAnalyzer, AspectSentiment
+from src.lexicon_absa import LexiconABSA
+
+
+class CascadeABSA(ABSAAnalyzer):
+    """
+    Confidence-based cascade: Lexicon -> Transformer -> LLM.
+
+    Every review goes through LexiconABSA. Aspects whose VADER-derived confidence
+    is below lexicon_threshold are re-classified by TransformerABSA, reusing the
+    parsed Doc and extracted aspects. Reviews that still have an aspect below
+    transformer_threshold are sent to LLMABSA, whose sentiment replaces that of
+    the matching aspects. The heavier tiers are only loaded when first needed.
+    """
+
+    def __init__(self, lexicon: Optional[LexiconABSA] = None, transformer=None, llm=None,
+                 lexicon_threshold: float = 0.3, transformer_threshold: float = 0.7,
+                 use_transformer: bool = True, use_llm: bool = True):
+        self.lexicon = lexicon or LexiconABSA()
+        self.load_times = dict(getattr(self.lexicon, 'load_times', {}))
+        self._transformer = transformer
+        self._llm = llm
+
+        self.lexicon_threshold = lexicon_threshold
+        self.transformer_threshold = transformer_threshold
+        self.use_transformer = use_transformer
+        self.use_llm = use_llm
+
+        self.reset_tier_stats()
+
+    @property
+    def transformer(self):
+        if self._transformer is None:
+            from src.transformer_absa import TransformerABSA
+            self._transformer = TransformerABSA(nlp=self.lexicon.nlp)
+            self._transformer.instrument(self.instrumentation)
+        return self._transformer
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from src.llm_absa import LLMABSA
+            self._llm = LLMABSA()
+            self._llm.instrument(self.instrumentation)
+        return self._llm
+
+    def instrument(self, instrumentation=None):
+        """Attach an instrumentation sink to the cascade and all of its (loaded) tiers."""
+        instrumentation = super().instrument(instrumentation)
+        for tier in (self.lexicon, self._transformer, self._llm):
+            if isinstance(tier, ABSAAnalyzer):
+                tier.instrument(instrumentation)
+        return instrumentation
+
+    def analyze(self, text: str) -> List[AspectSentiment]:
+        instrumentation = self.instrumentation
+        with instrumentation.call(), instrumentation.stage('analyze'):
+            start = time.perf_counter()
+            doc = self.lexicon._parse(text)
+            self._stats['seconds']['lexicon'] += time.perf_counter() - start
+            return self._analyze_doc(doc)
+
+    def analyze_stream(self, texts: Iterable[str], batch_size: int = 64,
+                       n_process: int = 1) -> Iterator[List[AspectSentiment]]:
+        instrumentation = self.instrumentation
+        docs = self.lexicon._parse_stream(texts, batch_size=batch_size, n_process=n_process)
+        while True:
+            # Parsing is part of the lexicon tier; a batch is parsed when its first Doc is requested
+            start = time.perf_counter()
+            doc = next(docs, None)
+            self._stats['seconds']['lexicon'] += time.perf_counter() - start
+            if doc is None:
+                return
+            with instrumentation.call(), instrumentation.stage('analyze_doc'):
+                results = self._analyze_doc(doc)
+            yield results
+
+    def _aspect_key(self, aspect: str) -> str:
+        # Compared as evaluation.score does; aspects the normalizer strips entirely stay as written
+        return self.lexicon._normalize_aspect(aspect).lower().strip() or aspect.lower().strip()
+
+    def _analyze_doc(self, doc) -> List[AspectSentiment]:
+        stats = self._stats
+        stats['reviews'] += 1
+
+        # Tier 1: lexicon on every aspect (parse time is added by the callers)
+        start = time.perf_counter()
+        aspects = self.lexicon._get_candidate_aspects(doc)
+        results = self.lexicon._get_aspect_sentiments(aspects, doc)
+        stats['seconds']['lexicon'] += time.perf_counter() - start
+        stats['aspects'] += len(results)
+
+        uncertain = [i for i, r in enumerate(results) if r.confidence < self.lexicon_threshold]
+
+        # Tier 2: transformer on the uncertain aspects of this review only
+        if uncertain and self.use_transformer:
+            start = time.perf_counter()
+            predictions = self.transformer._classify_pairs(
+                [(doc.text, results[i].aspect) for i in uncertain]
+            )
+            for i, prediction in zip(uncertain, predictions):
+                results[i] = AspectSentiment(
+                    aspect=results[i].aspect,
+                    sentiment=prediction['label'],
+                    confidence=prediction['score'],
+                    text_span=results[i].text_span
+                )
+            stats['seconds']['transformer'] += time.perf_counter() - start
+            stats['transformer_aspects'] += len(uncertain)
+            uncertain = [i for i in uncertain if results[i].confidence < self.transformer_threshold]
+
+        # Tier 3: LLM on whole reviews that are still uncertain
+        if uncertain and self.use_llm:
+            start = time.perf_counter()
+            llm_results = {self._aspect_key(r.aspect): r for r in self.llm.analyze(doc.text)}
+            matched = 0
+            for i in uncertain:
+                match = llm_results.get(self._aspect_key(results[i].aspect))
+                if match is not None:
+                    matched += 1
+                    results[i] = AspectSentiment(
+                        aspect=results[i].aspect,
+                        sentiment=match.sentiment,
+                        confidence=match.confidence,
+                        text_span=results[i].text_span
+                    )
+            stats['seconds']['llm'] += time.perf_counter() - start
+            stats['llm_reviews'] += 1
+            stats['llm_aspects'] += len(uncertain)
+            stats['llm_unmatched_aspects'] += len(uncertain) - matched
+            if not matched:
+                stats['llm_unmatched_reviews'] += 1
+
+        return results
+
+    # ==================== TIER STATISTICS ====================
+
+    def reset_tier_stats(self) -> None:
+        self._stats = {
+            'reviews': 0,
+            'aspects': 0,
+            'transformer_aspects': 0,
+            'llm_reviews': 0,
+            'llm_aspects': 0,
+            'llm_unmatched_aspects': 0,  # escalated aspects the LLM answer had no match for
+            'llm_unmatched_reviews': 0,  # LLM calls whose answer replaced nothing
+            'seconds': {'lexicon': 0.0, 'transformer': 0.0, 'llm': 0.0}
+        }
+
+    def tier_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Share of traffic that reached each tier, time spent per tier and resulting
+        throughput. Lexicon time includes spaCy parsing.
+        """
+        stats = self._stats
+        reviews = stats['reviews']
+        aspects = stats['aspects']
+        total_seconds = sum(stats['seconds'].values())
+
+        return {
+            'lexicon': {
+                'reviews': reviews,
+                'aspects': aspects,
+                'aspects_resolved_fraction': (aspects - stats['transformer_aspects']) / aspects if aspects else 0.0,
+                'seconds': stats['seconds']['lexicon']
+            },
+            'transformer': {
+                'aspects': stats['transformer_aspects'],
+                'aspects_fraction': stats['transformer_aspects'] / aspects if aspects else 0.0,
+                'seconds': stats['seconds']['transformer']
+            },
+            'llm': {
+                'reviews': stats['llm_reviews'],
+                'reviews_fraction': stats['llm_reviews'] / reviews if reviews else 0.0,
+                'aspects': stats['llm_aspects'],
+                'unmatched_aspects': stats['llm_unmatched_aspects'],
+                'unmatched_reviews': stats['llm_unmatched_reviews'],
+                'seconds': stats['seconds']['llm']
+            },
+            'overall': {
+                'reviews': reviews,
+                'seconds': total_seconds,
+                'throughput_texts_per_second': reviews / total_seconds if total_seconds > 0 else 0.0
+            }
+        }
@@ -0,0 +1,216 @@
+"""
+Accuracy of ABSA analyzers against gold aspect/sentiment annotations.
+
+Gold files are lists of {"text": ..., "expected": [{"aspect": ..., "sentiment": ...}]}
+(see data/tests.json). Predicted and gold aspects are matched one-to-one per review
+after normalization, exactly first and then by token overlap.
+
+    python -m src.evaluation --analyzer lexicon --gold data/tests.json
+"""
+import argparse
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.normalizer import AspectNormalizer
+from src.runner import ANALYZERS, load_analyzer
+
+Pair = Tuple[str, str]  # (aspect, sentiment)
+
+
+def load_gold(path: str) -> List[dict]:
+    """Read a gold file; each entry has 'text' and 'expected' aspect/sentiment pairs."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _as_pairs(review: Iterable) -> List[Pair]:
+    # Accepts AspectSentiment objects, gold dicts or (aspect, sentiment) tuples
+    pairs = []
+    for item in review:
+        if isinstance(item, dict):
+            pairs.append((item['aspect'], item['sentiment']))
+        elif isinstance(item, tuple):
+            pairs.append(item)
+        else:
+            pairs.append((item.aspect, item.sentiment))
+    return pairs
+
+
+def match_review(predicted: Sequence[str], gold: Sequence[str],
+                 fuzzy_threshold: float = 0.5) -> List[Tuple[int, int]]:
+    """
+    One-to-one matching of normalized predicted and gold aspects of a review.
+
+    Exact matches are taken first. The remaining aspects are paired greedily by
+    token-set Jaccard similarity, best first, if it reaches fuzzy_threshold.
+    Candidates come from a token index over the gold aspects, so only pairs
+    sharing a token are ever scored.
+
+    Returns:
+        List of (predicted index, gold index) pairs
+    """
+    matches = []
+    used_pred = set()
+    used_gold = set()
+
+    gold_by_text = defaultdict(list)
+    for g, aspect in enumerate(gold):
+        gold_by_text[aspect].append(g)
+    for p, aspect in enumerate(predicted):
+        candidates = gold_by_text.get(aspect)
+        if candidates:
+            g = candidates.pop(0)
+            matches.append((p, g))
+            used_pred.add(p)
+            used_gold.add(g)
+
+    if fuzzy_threshold > 1.0:
+        return matches
+
+    gold_tokens = [frozenset(aspect.split()) for aspect in gold]
+    index = defaultdict(set)
+    for g, tokens in enumerate(gold_tokens):
+        if g not in used_gold:
+            for token in tokens:
+                index[token].add(g)
+
+    scored = []
+    for p, aspect in enumerate(predicted):
+        if p in used_pred:
+            continue
+        tokens = frozenset(aspect.split())
+        for g in set().union(*(index.get(token, ()) for token in tokens)):
+            similarity = len(tokens & gold_tokens[g]) / len(tokens | gold_tokens[g])
+            if similarity >= fuzzy_threshold:
+                scored.append((-similarity, p, g))
+
+    for _, p, g in sorted(scored):
+        if p not in used_pred and g not in used_gold:
+            matches.append((p, g))
+            used_pred.add(p)
+            used_gold.add(g)
+
+    return matches
+
+
+def _f1(precision: float, recall: float) -> float:
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+def score(predictions: Iterable[Iterable], gold: Iterable[Iterable],
+          normalize: Optional[Callable[[str], str]] = None,
+          fuzzy_threshold: float = 0.5) -> Dict[str, float]:
+    """
+    Precision, recall and F1 of aspect extraction, and sentiment accuracy on matched aspects.
+
+    Args:
+        predictions: Per-review predictions (AspectSentiment objects or (aspect, sentiment) tuples)
+        gold: Per-review gold pairs (dicts as in data/tests.json or tuples)
+        normalize: Aspect normalization applied to both sides (default: AspectNormalizer)
+        fuzzy_threshold: Minimum token Jaccard similarity for a fuzzy match (> 1 disables fuzzy matching)
+
+    Returns:
+        Aspect precision/recall/F1, sentiment accuracy over matched aspects and
+        pair precision/recall/F1, where a match also needs the right sentiment
+
+    Raises:
+        ValueError: If predictions and gold cover a different number of reviews
+    """
+    predictions = list(predictions)
+    gold = list(gold)
+    if len(predictions) != len(gold):
+        raise ValueError(f"Got predictions for {len(predictions)} reviews but gold for {len(gold)}")
+
+    normalize = normalize or AspectNormalizer()
+
+    def key(aspect: str) -> str:
+        # Aspects the normalizer strips entirely are compared as written
+        return normalize(aspect).lower().strip() or aspect.lower().strip()
+
+    n_predicted = n_gold = n_matched = n_sentiment_correct = 0
+    for predicted, expected in zip(predictions, gold):
+        predicted = _as_pairs(predicted)
+        expected = _as_pairs(expected)
+        matches = match_review([key(a) for a, _ in predicted], [key(a) for a, _ in expected],
+                               fuzzy_threshold)
+
+        n_predicted += len(predicted)
+        n_gold += len(expected)
+        n_matched += len(matches)
+        n_sentiment_correct += sum(1 for p, g in matches
+                                   if predicted[p][1].lower() == expected[g][1].lower())
+
+    precision = n_matched / n_predicted if n_predicted else 0.0
+    recall = n_matched / n_gold if n_gold else 0.0
+    pair_precision = n_sentiment_correct / n_predicted if n_predicted else 0.0
+    pair_recall = n_sentiment_correct / n_gold if n_gold else 0.0
+
+    return {
+        'precision': precision,
+        'recall': recall,
+        'f1': _f1(precision, recall),
+        'sentiment_accuracy': n_sentiment_correct / n_matched if n_matched else 0.0,
+        'pair_precision': pair_precision,
+        'pair_recall': pair_recall,
+        'pair_f1': _f1(pair_precision, pair_recall),
+        'predicted': n_predicted,
+        'gold': n_gold,
+        'matched': n_matched
+    }
+
+
+def evaluate(analyzer, gold: List[dict], batch_size: int = 64,
+             fuzzy_threshold: float = 0.5) -> Dict[str, Dict[str, float]]:
+    """
+    Run an analyzer over the gold texts once and report accuracy alongside speed.
+
+    Aspects are normalized with the analyzer's own _normalize_aspect where it has one.
+
+    Returns:
+        {'accuracy': score(...), 'speed': {...}}
+    """
+    texts = [entry['text'] for entry in gold]
+
+    start = time.perf_counter()
+    predictions = analyzer.analyze_batch(texts, batch_size=batch_size)
+    total_time = time.perf_counter() - start
+
+    normalize = getattr(analyzer, '_normalize_aspect', None)
+    return {
+        'accuracy': score(predictions, [entry['expected'] for entry in gold],
+                          normalize=normalize, fuzzy_threshold=fuzzy_threshold),
+        'speed': {
+            'total_time': total_time,
+            'avg_time_per_text': total_time / len(texts) if texts else 0.0,
+            'throughput_texts_per_second': len(texts) / total_time if total_time > 0 else 0.0,
+            'texts_processed': len(texts)
+        }
+    }
+
+
+def compare_accuracy(analyzers: Dict[str, object], gold: List[dict],
+                     fuzzy_threshold: float = 0.5) -> Dict[str, Dict]:
+    """Accuracy and speed of several analyzers on the same gold set, keyed by analyzer name."""
+    return {name: evaluate(analyzer, gold, fuzzy_threshold=fuzzy_threshold)
+            for name, analyzer in analyzers.items()}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Score analyzers against gold aspect/sentiment annotations.")
+    parser.add_argument('--analyzer', action='append',
+                        help=f"One of {', '.join(ANALYZERS)} or a 'module:Class' spec; repeatable (default: lexicon)")
+    parser.add_argument('--gold', default='data/tests.json')
+    parser.add_argument('--fuzzy-threshold', type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    gold = load_gold(args.gold)
+    report = {}
+    for spec in args.analyzer or ['lexicon']:
+        report[spec] = evaluate(load_analyzer(spec), gold, fuzzy_threshold=args.fuzzy_threshold)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
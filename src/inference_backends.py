@@ -0,0 +1,257 @@
+"""
+CPU inference backends for the transformer sequence classifier.
+
+'fp32' runs the PyTorch model as loaded. 'int8' applies dynamic int8
+quantization to its Linear layers (weights stored as int8, activations
+quantized on the fly). 'onnx' runs an exported graph under ONNX Runtime, an
+optional dependency. The quantized model and the exported graph are written
+once to a cache directory, keyed by model name and revision, and loaded from
+there afterwards.
+
+Agreement of the faster backends with fp32 on the gold reviews:
+
+    python -m src.inference_backends --backend int8 --backend onnx --gold data/tests.json
+"""
+import argparse
+import inspect
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import torch
+from transformers import AutoConfig, AutoModelForSequenceClassification
+
+from src.metrics import MB
+from src.startup import PROJECT_ROOT
+
+BACKENDS = ('fp32', 'int8', 'onnx')
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'absa-backends')
+DEFAULT_GOLD_PATH = os.path.join(PROJECT_ROOT, 'data', 'tests.json')
+ONNX_OPSET = 14
+
+
+def _tensor_bytes(value) -> int:
+    # Packed quantized Linear weights are stored as (weight, bias) tuples
+    if isinstance(value, torch.Tensor):
+        return value.numel() * value.element_size()
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(v) for v in value)
+    return 0
+
+
+class TorchBackend:
+    """Eager PyTorch model, full precision or dynamically quantized"""
+
+    def __init__(self, model, name: str = 'fp32', path: Optional[str] = None):
+        self.model = model
+        self.name = name
+        self.path = path  # cached artifact, if any
+
+    def logits(self, inputs) -> torch.Tensor:
+        with torch.no_grad():
+            return self.model(**inputs).logits
+
+    def footprint(self) -> Dict[str, float]:
+        parameters = list(self.model.parameters())
+        buffers = list(self.model.buffers())
+        return {
+            'backend': self.name,
+            'parameters': sum(p.numel() for p in parameters),
+            'parameters_mb': sum(p.numel() * p.element_size() for p in parameters) / MB,
+            'buffers_mb': sum(b.numel() * b.element_size() for b in buffers) / MB,
+            # Includes the packed int8 weights, which are not parameters
+            'weights_mb': sum(_tensor_bytes(v) for v in self.model.state_dict().values()) / MB
+        }
+
+
+class OnnxBackend:
+    """Exported graph run with ONNX Runtime on the CPU"""
+
+    name = 'onnx'
+
+    def __init__(self, path: str, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.path = path
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        # The exporter drops inputs the graph does not use (e.g. token_type_ids)
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def logits(self, inputs) -> torch.Tensor:
+        feed = {name: inputs[name].numpy() for name in self.input_names}
+        return torch.from_numpy(self.session.run(['logits'], feed)[0])
+
+    def footprint(self) -> Dict[str, float]:
+        return {
+            'backend': self.name,
+            'file_mb': os.path.getsize(self.path) / MB
+        }
+
+
+def artifact_dir(model_name: str, cache_dir: Optional[str] = None, local_files_only: bool = False) -> str:
+    """Cache directory for one model: <cache_dir>/<model name>/<hub revision or 'local'>."""
+    config = AutoConfig.from_pretrained(model_name, local_files_only=local_files_only)
+    revision = getattr(config, '_commit_hash', None) or 'local'
+    safe_name = re.sub(r'[^\w.-]+', '--', model_name.strip('/'))
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, safe_name, revision)
+
+
+def _load_fp32(model_name: str, local_files_only: bool = False):
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, local_files_only=local_files_only)
+    model.eval()
+    return model
+
+
+def _quantize(model):
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _write_atomic(path: str, write) -> None:
+    # Concurrent workers may build the same artifact; only complete files are renamed into place
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load_int8(model_name: str, directory: str, local_files_only: bool = False) -> TorchBackend:
+    # Only tensors are stored (loaded with weights_only, so nothing is unpickled);
+    # the quantized module is rebuilt from the config without reading the fp32 weights
+    path = os.path.join(directory, f"int8-torch{torch.__version__}.pt")
+    if os.path.exists(path):
+        config = AutoConfig.from_pretrained(model_name, local_files_only=local_files_only)
+        model = _quantize(AutoModelForSequenceClassification.from_config(config))
+        model.load_state_dict(torch.load(path, weights_only=True))
+    else:
+        model = _quantize(_load_fp32(model_name, local_files_only))
+        _write_atomic(path, lambda tmp_path: torch.save(model.state_dict(), tmp_path))
+    model.eval()
+    return TorchBackend(model, name='int8', path=path)
+
+
+def export_onnx(model, tokenizer, path: str, opset: int = ONNX_OPSET) -> None:
+    """Export a sequence classifier with dynamic batch and sequence axes."""
+    encoding = tokenizer("The pizza was delicious.", "pizza", return_tensors='pt')
+    # Graph inputs follow forward()'s argument order, not the tokenizer's
+    input_names = [name for name in inspect.signature(model.forward).parameters if name in encoding]
+    sample = {name: encoding[name] for name in input_names}
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['logits'] = {0: 'batch'}
+    # Newer torch defaults to the dynamo exporter, which does not take dynamic_axes
+    options = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+
+    with torch.no_grad():
+        torch.onnx.export(model, (sample,), path, input_names=input_names, output_names=['logits'],
+                          dynamic_axes=dynamic_axes, opset_version=opset, do_constant_folding=True, **options)
+
+
+def _load_onnx(model_name: str, tokenizer, directory: str, num_threads: Optional[int],
+               local_files_only: bool = False) -> OnnxBackend:
+    path = os.path.join(directory, f"model-opset{ONNX_OPSET}.onnx")
+    if not os.path.exists(path):
+        model = _load_fp32(model_name, local_files_only)
+        _write_atomic(path, lambda tmp_path: export_onnx(model, tokenizer, tmp_path))
+    return OnnxBackend(path, num_threads=num_threads)
+
+
+def load_backend(backend: str, model_name: str, tokenizer=None, cache_dir: Optional[str] = None,
+                 num_threads: Optional[int] = None, local_files_only: bool = False):
+    """
+    Load a classifier backend for model_name.
+
+    Args:
+        backend: 'fp32', 'int8' or 'onnx'
+        tokenizer: Needed to trace the ONNX export
+        cache_dir: Where quantized models and exported graphs are kept (default: ~/.cache/absa-backends)
+        num_threads: Intra-op threads: the ONNX Runtime session's, or torch.set_num_threads
+            for fp32/int8 (which applies to the whole process)
+        local_files_only: Only use weights and configs already in the Hugging Face cache
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    if num_threads and backend != 'onnx':
+        torch.set_num_threads(num_threads)
+    if backend == 'fp32':
+        return TorchBackend(_load_fp32(model_name, local_files_only))
+
+    directory = artifact_dir(model_name, cache_dir, local_files_only)
+    if backend == 'int8':
+        return _load_int8(model_name, directory, local_files_only)
+    return _load_onnx(model_name, tokenizer, directory, num_threads, local_files_only)
+
+
+def agreement(reference: torch.Tensor, candidate: torch.Tensor) -> Dict[str, float]:
+    """Label agreement and probability drift between two (pairs x labels) probability tensors."""
+    if not len(reference):
+        return {'pairs': 0, 'label_agreement': 1.0, 'disagreements': 0,
+                'max_probability_drift': 0.0, 'mean_probability_drift': 0.0}
+    agree = reference.argmax(dim=-1) == candidate.argmax(dim=-1)
+    drift = (reference - candidate).abs()
+    return {
+        'pairs': len(reference),
+        'label_agreement': agree.float().mean().item(),
+        'disagreements': int((~agree).sum().item()),
+        'max_probability_drift': drift.max().item(),
+        'mean_probability_drift': drift.mean().item()
+    }
+
+
+def gold_pairs(analyzer, texts: Sequence[str]) -> List[Tuple[str, str]]:
+    """The (review, aspect) pairs the analyzer would classify for the given reviews."""
+    return [(doc.text, analyzer._normalize_aspect(analyzer._get_text(aspect)))
+            for doc in analyzer._parse_stream(texts)
+            for aspect in analyzer._get_candidate_aspects(doc)]
+
+
+def check_agreement(backends: Sequence[str] = ('int8', 'onnx'), gold_path: str = DEFAULT_GOLD_PATH,
+                    **analyzer_kwargs) -> Dict[str, Dict]:
+    """
+    Compare backends against fp32 on the aspect pairs extracted from the gold reviews.
+
+    Returns:
+        {backend: agreement(...) plus 'seconds' (model time over all pairs)}, including fp32 itself
+    """
+    from src.evaluation import load_gold
+    from src.transformer_absa import TransformerABSA
+
+    texts = [entry['text'] for entry in load_gold(gold_path)]
+    reference = TransformerABSA(backend='fp32', **analyzer_kwargs)
+    pairs = gold_pairs(reference, texts)
+
+    start = time.perf_counter()
+    baseline = reference._class_probabilities(pairs)
+    report = {'fp32': dict(agreement(baseline, baseline), seconds=time.perf_counter() - start)}
+
+    for backend in backends:
+        analyzer = TransformerABSA(backend=backend, nlp=reference.nlp, **analyzer_kwargs)
+        start = time.perf_counter()
+        probabilities = analyzer._class_probabilities(pairs)
+        report[backend] = dict(agreement(baseline, probabilities), seconds=time.perf_counter() - start)
+
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Agreement of the transformer inference backends with fp32.")
+    parser.add_argument('--backend', action='append', choices=[b for b in BACKENDS if b != 'fp32'],
+                        help="Repeatable (default: int8 and onnx)")
+    parser.add_argument('--gold', default=DEFAULT_GOLD_PATH)
+    parser.add_argument('--cache-dir', default=None)
+    args = parser.parse_args(argv)
+
+    report = check_agreement(args.backend or ['int8', 'onnx'], args.gold, backend_cache_dir=args.cache_dir)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Per-stage timing, counters and profiling hooks for the analyzers.
+
+Analyzers report into ``self.instrumentation``, which defaults to a shared no-op
+object, so the hooks cost one attribute lookup and an empty context manager
+when nobody is listening. Attach a StageRecorder to collect numbers:
+
+    recorder = analyzer.instrument(StageRecorder())
+    analyzer.analyze_batch(texts)
+    recorder.stats()          # per-stage time and latency histograms, counters
+    recorder.export('stats.json')
+"""
+import cProfile
+import io
+import json
+import math
+import pstats
+import time
+from typing import Dict, List, Optional
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """No-op instrumentation; the default for every analyzer"""
+
+    enabled = False
+
+    def stage(self, name: str):
+        """Context manager timing one execution of a named stage."""
+        return _NULL_STAGE
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration measured elsewhere under a stage name."""
+        pass
+
+    def call(self):
+        """Context manager wrapping one top-level analyze call (used for per-call profiling)."""
+        return _NULL_STAGE
+
+    def stats(self) -> Dict:
+        return {}
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+class LatencyHistogram:
+    """
+    Log-scale histogram of durations: four buckets per power of two, starting
+    at one microsecond. Constant memory however many values are recorded;
+    percentiles are accurate to the bucket width (about 19%).
+    """
+
+    BUCKETS_PER_OCTAVE = 4
+    MIN_SECONDS = 1e-6
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _bucket(self, seconds: float) -> int:
+        if seconds <= self.MIN_SECONDS:
+            return 0
+        return int(math.log2(seconds / self.MIN_SECONDS) * self.BUCKETS_PER_OCTAVE) + 1
+
+    def _upper_bound(self, bucket: int) -> float:
+        return self.MIN_SECONDS * 2 ** (bucket / self.BUCKETS_PER_OCTAVE)
+
+    def add(self, seconds: float) -> None:
+        bucket = self._bucket(seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100), capped at the maximum."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self._upper_bound(bucket), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        if not self.count:
+            return {'calls': 0, 'total_seconds': 0.0}
+        return {
+            'calls': self.count,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count,
+            'min_seconds': self.min,
+            'p50_seconds': self.percentile(50),
+            'p90_seconds': self.percentile(90),
+            'p99_seconds': self.percentile(99),
+            'max_seconds': self.max,
+            'histogram': {f"{self._upper_bound(b):.3g}": n for b, n in sorted(self.buckets.items())}
+        }
+
+
+class _Stage:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.add(time.perf_counter() - self.start)
+        return False
+
+
+class _ProfiledCall:
+    __slots__ = ('profiler', 'owner')
+
+    def __init__(self, owner: 'StageRecorder'):
+        self.owner = owner
+        self.profiler = cProfile.Profile()
+
+    def __enter__(self):
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        self.owner._add_profile(self.profiler)
+        return False
+
+
+class StageRecorder(Instrumentation):
+    """
+    Collects stage latency histograms and counters.
+
+    Args:
+        profile: Run every top-level analyze call under cProfile and aggregate the results
+        keep_call_profiles: With profile, also keep the pstats.Stats of the slowest N calls
+    """
+
+    enabled = True
+
+    def __init__(self, profile: bool = False, keep_call_profiles: int = 0):
+        self.profile = profile
+        self.keep_call_profiles = keep_call_profiles
+        self.reset()
+
+    def reset(self) -> None:
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._profile_stats: Optional[pstats.Stats] = None
+        self.slowest_calls: List[tuple] = []  # (seconds, pstats.Stats)
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.stages.get(name)
+        if histogram is None:
+            histogram = self.stages[name] = LatencyHistogram()
+        return histogram
+
+    def stage(self, name: str):
+        return _Stage(self._histogram(name))
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float) -> None:
+        self._histogram(name).add(seconds)
+
+    def call(self):
+        return _ProfiledCall(self) if self.profile else _NULL_STAGE
+
+    def _add_profile(self, profiler: cProfile.Profile) -> None:
+        stats = pstats.Stats(profiler)
+        if self.keep_call_profiles:
+            self.slowest_calls.append((stats.total_tt, stats))
+            self.slowest_calls.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest_calls[self.keep_call_profiles:]
+            stats = pstats.Stats(profiler)  # the kept copy must not be merged into
+        if self._profile_stats is None:
+            self._profile_stats = stats
+        else:
+            self._profile_stats.add(stats)
+
+    def profile_report(self, sort: str = 'cumulative', limit: int = 30) -> str:
+        """Aggregated cProfile table over all profiled calls ('' when profiling is off)."""
+        if self._profile_stats is None:
+            return ''
+        out = io.StringIO()
+        self._profile_stats.stream = out
+        self._profile_stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump_profile(self, path: str) -> None:
+        """Write the aggregated profile for snakeviz/pstats."""
+        if self._profile_stats is not None:
+            self._profile_stats.dump_stats(path)
+
+    def stats(self) -> Dict:
+        return {
+            'stages': {name: histogram.summary() for name, histogram in self.stages.items()},
+            'counters': dict(self.counters)
+        }
+
+    def export(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats(), f, indent=2)
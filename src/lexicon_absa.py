@@ -1,4 +1,5 @@
-import re
+import logging
+import time
 from typing import List
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import sys
@@ -6,49 +7,48 @@ import sys
 sys.path.insert(0, '.')
 from src.base import ABSAAnalyzer, AspectSentiment
 from src.utils import AspectExtractionMixin
+from src.valence import ValenceScorer
+
+logger = logging.getLogger(__name__)
 
 
 class LexiconABSA(AspectExtractionMixin, ABSAAnalyzer):
+    _NEGATION_WORDS = frozenset({'no', 'not', "n't", 'never', 'none'})
+    _NEGATION_WINDOW = 4  # preceding tokens searched for a negation word
+
     def __init__(self):
         AspectExtractionMixin.__init__(self)
-        self.vader = SentimentIntensityAnalyzer()
-
-    def analyze(self, text: str) -> List[AspectSentiment]:
-        # small cleanup
-        text = re.sub(r'\([^)]*\)', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        doc = self.nlp(text)
-
-        # extract raw candidates
-        candidates = self._extract_aspects(doc)
-
-        # try merging candidates that appear together with "and" / ","
-        merged = self._merge_coordinated_aspects(candidates, doc, text)  # From mixin
 
-        # THEN normalize & dedupe
-        normalized = []
-        seen = set()
-        for c in merged:
-            norm = self._normalize_aspect(self._get_text(c)).lower()  # From mixin
-            if norm not in seen and norm:
-                normalized.append(c)
-                seen.add(norm)
+        start = time.perf_counter()
+        self.vader = SentimentIntensityAnalyzer()
+        self.valence = ValenceScorer(self.vader)  # same compound scores, without re-tokenizing
+        self.load_times['vader'] = time.perf_counter() - start
 
-        print(
-            f"DEBUG: Found {len(normalized)} aspects: {[self._normalize_aspect(self._get_text(a)) for a in normalized]}")
+    def _analyze_doc(self, doc) -> List[AspectSentiment]:
+        normalized = self._get_candidate_aspects(doc)  # From mixin
 
-        results = []
-        for aspect in normalized:
-            sentiment_info = self._get_aspect_sentiment(aspect, doc)
-            if sentiment_info:
-                results.append(sentiment_info)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found %d aspects: %s", len(normalized),
+                         [self._normalize_aspect(self._get_text(a)) for a in normalized])
 
-        return results
+        return self._get_aspect_sentiments(normalized, doc)
 
     # -----------------------
     # Sentiment extraction (Lexicon-specific)
     # -----------------------
-    def _get_aspect_sentiment(self, aspect, doc):
+    def _get_aspect_sentiments(self, aspects, doc) -> List[AspectSentiment]:
+        """
+        Sentiment of each aspect of a Doc. Per-Doc state (negation scopes and
+        sentence scores, filled as sentences are needed) is built here and passed down.
+        """
+        if not aspects:
+            return []
+        with self.instrumentation.stage('negation'):
+            negation_scope = self._compute_negation_scope(doc)
+        sentence_scores = {}
+        return [self._get_aspect_sentiment(aspect, doc, negation_scope, sentence_scores) for aspect in aspects]
+
+    def _get_aspect_sentiment(self, aspect, doc, negation_scope=None, sentence_scores=None):
         aspect_root = self._get_root(aspect)
         opinion_tokens = []
 
@@ -62,16 +62,16 @@ class LexiconABSA(AspectExtractionMixin, ABSAAnalyzer):
                 if child.dep_ in {'acomp', 'xcomp', 'advmod', 'attr', 'dobj'}:
                     opinion_tokens.append(child)
 
-        if opinion_tokens:
-            opinion_tokens = sorted(set(opinion_tokens), key=lambda t: t.i)
-            context = ' '.join([t.text for t in opinion_tokens])
-        else:
-            context = aspect_root.sent.text.strip()
+        instrumentation = self.instrumentation
+        with instrumentation.stage('vader'):
+            if opinion_tokens:
+                opinion_tokens = sorted(set(opinion_tokens), key=lambda t: t.i)
+                compound = self.valence.compound(' '.join([t.text for t in opinion_tokens]))
+            else:
+                compound = self._sentence_compound(aspect_root.sent, sentence_scores)
 
-        is_negated = self._check_negation(aspect_root)
+        is_negated = self._check_negation(aspect_root, negation_scope)
 
-        scores = self.vader.polarity_scores(context)
-        compound = scores['compound']
         if is_negated:
             compound = -compound
 
@@ -92,20 +92,61 @@ class LexiconABSA(AspectExtractionMixin, ABSAAnalyzer):
             text_span=(self._get_start_char(aspect), self._get_end_char(aspect))
         )
 
-    def _check_negation(self, token) -> bool:
-        for child in token.children:
-            if child.dep_ == 'neg' or child.lower_ in {'no', 'not', "n't", 'never', 'none'}:
-                return True
-
-        for anc in token.ancestors:
-            for c in anc.children:
-                if c.dep_ == 'neg' or c.lower_ in {'no', 'not', "n't", 'never', 'none'}:
-                    return True
-
-        doc = token.doc
-        start = max(0, token.i - 4)
-        for i in range(start, token.i):
-            if doc[i].lower_ in {'no', 'not', "n't", 'never', 'none'}:
-                return True
-
-        return False
\ No newline at end of file
+    def _sentence_compound(self, sent, scores=None) -> float:
+        """VADER compound score of a sentence; scores (sentence start -> score) memoizes them per Doc."""
+        if scores is None:
+            return self.valence.compound(sent.text.strip())
+        compound = scores.get(sent.start)
+        if compound is None:
+            compound = scores[sent.start] = self.valence.compound(sent.text.strip())
+        return compound
+
+    def _check_negation(self, token, negation_scope=None) -> bool:
+        """Whether token is negated; pass the Doc's _compute_negation_scope to avoid recomputing it."""
+        if negation_scope is None:
+            negation_scope = self._compute_negation_scope(token.doc)
+        return bool(negation_scope[token.i])
+
+    def _compute_negation_scope(self, doc) -> bytearray:
+        """
+        One pass over the Doc marking each token that is negated: it or one of its
+        ancestors has a negation child ('neg' dependency or a negation word), or a
+        negation word occurs among the preceding _NEGATION_WINDOW tokens.
+        """
+        negation_words = self._NEGATION_WORDS
+        n = len(doc)
+        heads = [tok.head.i for tok in doc]
+        is_negation_word = [tok.lower_ in negation_words for tok in doc]
+
+        has_negation_child = bytearray(n)
+        for tok in doc:
+            if (tok.dep_ == 'neg' or is_negation_word[tok.i]) and heads[tok.i] != tok.i:
+                has_negation_child[heads[tok.i]] = 1
+
+        # Negated through the tree if the token or any ancestor has a negation child;
+        # resolved root-wards once per token and memoized (-1 = not yet known).
+        scope = [-1] * n
+        for i in range(n):
+            path = []
+            j = i
+            while scope[j] < 0:
+                if has_negation_child[j]:
+                    scope[j] = 1
+                    break
+                path.append(j)
+                if heads[j] == j:
+                    break
+                j = heads[j]
+            value = scope[j] if scope[j] >= 0 else 0
+            for k in path:
+                scope[k] = value
+
+        # Negation word within the window of preceding tokens
+        last_negation = -self._NEGATION_WINDOW - 1
+        result = bytearray(n)
+        for i in range(n):
+            result[i] = scope[i] or (i - last_negation <= self._NEGATION_WINDOW)
+            if is_negation_word[i]:
+                last_negation = i
+
+        return result
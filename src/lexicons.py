@@ -0,0 +1,136 @@
+import json
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List
+
+DEFAULT_FILTERS_PATH = os.path.join(os.path.dirname(__file__), 'resources', 'aspect_filters.json')
+
+
+class PrefixTrie:
+    """Character trie answering "does the text start with any stored prefix?" in O(len(prefix))"""
+
+    _END = ''
+
+    def __init__(self, prefixes: Iterable[str] = ()):
+        self._root: Dict[str, dict] = {}
+        for prefix in prefixes:
+            self.add(prefix)
+
+    def add(self, prefix: str) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._END] = True
+
+    def matches_prefix(self, text: str) -> bool:
+        node = self._root
+        if self._END in node:
+            return True
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+
+class SubstringMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
+
+    Reports whether any pattern occurs anywhere in a text with a single left-to-right
+    scan, independent of the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[bool] = [False]
+
+        for pattern in patterns:
+            if not pattern:
+                self._terminal[0] = True
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._terminal.append(False)
+                state = nxt
+            self._terminal[state] = True
+
+        # Breadth-first pass to wire failure links; a state is terminal if any
+        # pattern ends at it or at one of its proper suffixes.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._terminal[nxt] = self._terminal[nxt] or self._terminal[self._fail[nxt]]
+
+    def search(self, text: str) -> bool:
+        goto, fail, terminal = self._goto, self._fail, self._terminal
+        if terminal[0]:
+            return True
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+class AspectFilterLexicon:
+    """Compiled word lists used by AspectExtractionMixin._is_valid_aspect"""
+
+    def __init__(self, excluded_terms: Iterable[str], excluded_proper_nouns: Iterable[str],
+                 excluded_prefixes: Iterable[str], excluded_substrings: Iterable[str]):
+        self.excluded_terms: FrozenSet[str] = frozenset(excluded_terms)
+        self.excluded_proper_nouns: FrozenSet[str] = frozenset(excluded_proper_nouns)
+        self.prefixes = PrefixTrie(excluded_prefixes)
+        self.substrings = SubstringMatcher(excluded_substrings)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AspectFilterLexicon':
+        terms = data.get('excluded_terms', {})
+        if isinstance(terms, dict):
+            # Grouped by category in the data file; one set at runtime
+            terms = [term for group in terms.values() for term in group]
+        return cls(
+            excluded_terms=terms,
+            excluded_proper_nouns=data.get('excluded_proper_nouns', []),
+            excluded_prefixes=data.get('excluded_prefixes', []),
+            excluded_substrings=data.get('excluded_substrings', [])
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> 'AspectFilterLexicon':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def is_excluded(self, normalized: str) -> bool:
+        """True if the normalized aspect is a filler term, has an excluded prefix or contains an excluded term."""
+        return (normalized in self.excluded_terms or
+                self.prefixes.matches_prefix(normalized) or
+                self.substrings.search(normalized))
+
+    def is_excluded_proper_noun(self, normalized: str) -> bool:
+        return normalized in self.excluded_proper_nouns
+
+
+@lru_cache(maxsize=None)
+def load_aspect_filters(path: str = DEFAULT_FILTERS_PATH) -> AspectFilterLexicon:
+    """Load and compile a filter file once per process."""
+    return AspectFilterLexicon.from_file(path)
@@ -1,32 +1,348 @@
 import ollama
+import asyncio
+import hashlib
 import json
-from typing import List
+import logging
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import sys
 sys.path.insert(0, '.')
 from src.base import ABSAAnalyzer, AspectSentiment
+from src.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalAspectParser:
+    """
+    Incremental parser for streamed ``{"aspects": [{...}, ...]}`` responses.
+
+    feed() accepts arbitrary chunks of the JSON text and returns every aspect
+    object of the top-level "aspects" array that was closed by that chunk.
+    """
+
+    def __init__(self):
+        self._text = ''
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._key = None
+        self._aspects_depth = None
+        self._object_start = None
+
+    def feed(self, chunk: str) -> List[dict]:
+        self._text += chunk
+        completed = []
+
+        while self._pos < len(self._text):
+            char = self._text[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = self._text[self._string_start:self._pos + 1]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif char == ':' and len(self._stack) == 1:
+                try:
+                    self._key = json.loads(self._last_string)
+                except (TypeError, ValueError):
+                    self._key = None
+            elif char == ',' and len(self._stack) == 1:
+                self._key = None
+            elif char in '{[':
+                if char == '[' and self._stack == ['{'] and self._key == 'aspects':
+                    self._aspects_depth = 2
+                elif char == '{' and self._aspects_depth == len(self._stack):
+                    self._object_start = self._pos
+                self._stack.append(char)
+            elif char in '}]' and self._stack:
+                self._stack.pop()
+                if char == '}' and self._object_start is not None and len(self._stack) == self._aspects_depth:
+                    try:
+                        completed.append(json.loads(self._text[self._object_start:self._pos + 1]))
+                    except ValueError:
+                        pass
+                    self._object_start = None
+                elif char == ']' and self._aspects_depth is not None and len(self._stack) < self._aspects_depth:
+                    self._aspects_depth = None
+
+            self._pos += 1
+
+        return completed
 
 
 class LLMABSA(ABSAAnalyzer):
-    def __init__(self, model="llama2"):
+    def __init__(self, model="llama2", host=None, max_concurrency=4, request_timeout=120.0,
+                 options=None, cache_size=1000, cache_path=None, cache_max_entries=100000,
+                 cache_ttl_seconds=None, cache_read_only=False):
         self.model = model
+        self.options = options  # Ollama generation options, e.g. {'temperature': 0}
+        self.load_times = {}  # no local components; the model lives in the Ollama server
+
+        self.host = host  # None -> OLLAMA_HOST or the local default
+        self.client = ollama.Client(host=host)
+
+        # Async path: at most max_concurrency requests in flight, each cancelled
+        # after request_timeout seconds
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+
+        # Parsed responses keyed by (model, prompt hash, options). cache_read_only
+        # replays an existing cache file without writing to it.
+        disk_cache = None
+        if cache_path:
+            disk_cache = SQLiteCache(cache_path, max_entries=cache_max_entries,
+                                     ttl_seconds=cache_ttl_seconds, read_only=cache_read_only)
+        self.cache = TieredCache(LRUCache(cache_size), disk_cache)
 
     def analyze(self, text: str) -> List[AspectSentiment]:
         prompt = self._create_prompt(text)
+        cache_key = self._cache_key(prompt)
+        cached = self.cache.get(cache_key)
+        try:
+            if cached is not None:
+                self.instrumentation.count('cache_hits')
+                return self._parse_response(cached)
+
+            self.instrumentation.count('cache_misses')
+            with self.instrumentation.stage('llm_request'):
+                response = self.client.chat(**self._chat_arguments(prompt))
+
+            result = json.loads(response['message']['content'])
+            aspects = self._parse_response(result)
+            self.cache.put(cache_key, result)
+            return aspects
+
+        except Exception as e:
+            logger.error("LLM request failed: %s", e)
+            return []
+
+    async def analyze_async(self, text: str, client: Optional[ollama.AsyncClient] = None) -> List[AspectSentiment]:
+        """
+        Asynchronous analyze(); errors and timeouts yield an empty list like analyze().
+
+        Args:
+            text: Input text to analyze
+            client: AsyncClient to reuse across requests; if omitted, one is opened
+                for this request and closed afterwards
+        """
+        prompt = self._create_prompt(text)
+        cache_key = self._cache_key(prompt)
+        cached = self.cache.get(cache_key)
+        if cached is None and client is None:
+            async with ollama.AsyncClient(host=self.host) as client:
+                return await self._request_async(client, prompt, cache_key, cached)
+        return await self._request_async(client, prompt, cache_key, cached)
 
+    async def _request_async(self, client: Optional[ollama.AsyncClient], prompt: str, cache_key: str,
+                             cached: Optional[dict]) -> List[AspectSentiment]:
         try:
-            response = ollama.chat(
-                model=self.model,
-                messages=[{'role': 'user', 'content': prompt}],
-                format='json'  # Request JSON output
-            )
+            if cached is not None:
+                self.instrumentation.count('cache_hits')
+                return self._parse_response(cached)
+
+            self.instrumentation.count('cache_misses')
+            response = await asyncio.wait_for(client.chat(**self._chat_arguments(prompt)),
+                                              timeout=self.request_timeout)
 
             result = json.loads(response['message']['content'])
-            return self._parse_response(result)
+            aspects = self._parse_response(result)
+            self.cache.put(cache_key, result)
+            return aspects
 
+        except asyncio.TimeoutError:
+            logger.error("LLM request timed out after %ss", self.request_timeout)
+            return []
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error("LLM request failed: %s", e)
             return []
 
+    async def analyze_many_async(self, texts: Iterable[str],
+                                 max_concurrency: Optional[int] = None) -> List[List[AspectSentiment]]:
+        """
+        Analyze texts concurrently with a bounded number of in-flight requests.
+
+        All requests share one AsyncClient, which is closed before returning.
+
+        Args:
+            texts: Input texts to analyze
+            max_concurrency: Overrides the instance's max_concurrency
+
+        Returns:
+            One list of AspectSentiment objects per input text, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async with ollama.AsyncClient(host=self.host) as client:
+            async def bounded(text):
+                async with semaphore:
+                    return await self.analyze_async(text, client)
+
+            return await asyncio.gather(*(bounded(text) for text in texts))
+
+    def stream_aspects(self, text: str) -> Iterator[AspectSentiment]:
+        """
+        Stream the model's answer and yield each aspect as soon as its JSON object is complete.
+
+        Args:
+            text: Input text to analyze
+
+        Yields:
+            AspectSentiment objects in the order the model generates them
+        """
+        prompt = self._create_prompt(text)
+        cache_key = self._cache_key(prompt)
+        cached = self.cache.get(cache_key)
+        parser = IncrementalAspectParser()
+        content = []
+        try:
+            if cached is not None:
+                self.instrumentation.count('cache_hits')
+                yield from self._parse_response(cached)
+                return
+
+            self.instrumentation.count('cache_misses')
+            complete = True
+            for part in self.client.chat(**self._chat_arguments(prompt), stream=True):
+                chunk = part['message']['content']
+                content.append(chunk)
+                for item in parser.feed(chunk):
+                    try:
+                        yield self._parse_item(item)
+                    except (KeyError, TypeError, ValueError, AttributeError):
+                        complete = False
+
+            # A response with skipped items would make analyze() fail on the cache hit
+            if complete:
+                self.cache.put(cache_key, json.loads(''.join(content)))
+
+        except Exception as e:
+            logger.error("LLM request failed: %s", e)
+
+    def analyze_stream(self, texts: Iterable[str], batch_size: int = 64,
+                       n_process: int = 1) -> Iterator[List[AspectSentiment]]:
+        # Each batch of texts is sent concurrently; results keep input order.
+        # Inside a running event loop (e.g. Jupyter) asyncio.run() is not
+        # available, so fall back to sequential requests.
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            yield from super().analyze_stream(texts, batch_size, n_process)
+            return
+
+        texts = iter(texts)
+        while True:
+            chunk = list(islice(texts, batch_size))
+            if not chunk:
+                return
+            yield from asyncio.run(self.analyze_many_async(chunk))
+
+    def analyze_packed(self, texts: List[str], token_budget: int = 2048,
+                       max_reviews_per_prompt: int = 16) -> List[List[AspectSentiment]]:
+        """
+        Analyze short reviews several at a time, sharing one instruction block per request.
+
+        Reviews are packed greedily in input order until the estimated prompt size
+        would exceed token_budget. Any review whose id is missing or malformed in the
+        packed response is re-sent on its own through analyze().
+
+        Args:
+            texts: Input texts to analyze
+            token_budget: Approximate prompt size limit per packed request, in tokens
+            max_reviews_per_prompt: Upper bound on reviews per packed request
+
+        Returns:
+            One list of AspectSentiment objects per input text, in input order
+        """
+        results = [None] * len(texts)
+
+        for pack in self._pack_reviews(texts, token_budget, max_reviews_per_prompt):
+            if len(pack) == 1:
+                results[pack[0]] = self.analyze(texts[pack[0]])
+                continue
+
+            ids = {f"r{n + 1}": i for n, i in enumerate(pack)}
+            parsed = self._request_packed([(review_id, texts[i]) for review_id, i in ids.items()])
+            for review_id, i in ids.items():
+                if review_id in parsed:
+                    results[i] = parsed[review_id]
+                else:
+                    results[i] = self.analyze(texts[i])
+
+        return results
+
+    def _pack_reviews(self, texts: List[str], token_budget: int,
+                      max_reviews_per_prompt: int) -> List[List[int]]:
+        overhead = self._estimate_tokens(self._create_packed_prompt([]))
+
+        packs = []
+        current = []
+        used = overhead
+        for i, text in enumerate(texts):
+            # id tag, quotes and newline around each review
+            cost = self._estimate_tokens(text) + 4
+            if current and (used + cost > token_budget or len(current) >= max_reviews_per_prompt):
+                packs.append(current)
+                current = []
+                used = overhead
+            current.append(i)
+            used += cost
+
+        if current:
+            packs.append(current)
+
+        return packs
+
+    def _estimate_tokens(self, text: str) -> int:
+        # ~4 characters per token for English text under Llama-style tokenizers
+        return len(text) // 4 + 1
+
+    def _request_packed(self, entries: List[Tuple[str, str]]) -> Dict[str, List[AspectSentiment]]:
+        prompt = self._create_packed_prompt(entries)
+        cache_key = self._cache_key(prompt)
+        result = self.cache.get(cache_key)
+
+        if result is not None:
+            self.instrumentation.count('cache_hits')
+        else:
+            self.instrumentation.count('cache_misses')
+            try:
+                with self.instrumentation.stage('llm_request'):
+                    response = self.client.chat(**self._chat_arguments(prompt))
+                result = json.loads(response['message']['content'])
+            except Exception as e:
+                logger.error("LLM request failed: %s", e)
+                return {}
+
+        parsed = self._parse_packed_response(result, [review_id for review_id, _ in entries])
+        if len(parsed) == len(entries):
+            self.cache.put(cache_key, result)
+        return parsed
+
+    def _chat_arguments(self, prompt: str) -> dict:
+        arguments = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'format': 'json'  # Request JSON output
+        }
+        if self.options:
+            arguments['options'] = self.options
+        return arguments
+
+    def _cache_key(self, prompt: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return make_cache_key(self.model, prompt_hash, json.dumps(self.options or {}, sort_keys=True))
 
     def _create_prompt(self, text: str) -> str:
         prompt = f"""You are an aspect-based sentiment analyzer. Analyze the following text and extract:
@@ -51,15 +367,67 @@ Be specific and only extract aspects that are explicitly mentioned. Provide your
 
         return prompt
 
+    def _create_packed_prompt(self, entries: List[Tuple[str, str]]) -> str:
+        reviews = '\n'.join(f'[{review_id}] "{text}"' for review_id, text in entries)
+        prompt = f"""You are an aspect-based sentiment analyzer. For EACH review below, extract:
+1. All aspects (features, entities, topics) mentioned
+2. The sentiment toward each aspect (positive, negative, or neutral)
+3. A confidence score (0.0 to 1.0)
+
+Reviews:
+{reviews}
+
+Return your analysis as a JSON object keyed by review id, with this structure:
+{{
+    "r1": {{
+        "aspects": [
+            {{
+                "aspect": "aspect name",
+                "sentiment": "positive|negative|neutral",
+                "confidence": 0.95
+            }}
+        ]
+    }},
+    "r2": {{
+        "aspects": []
+    }}
+}}
+
+Include every review id exactly once. Be specific and only extract aspects that are explicitly mentioned in that review. Provide your response ONLY as valid JSON, no additional text."""
+
+        return prompt
+
+    def _parse_packed_response(self, result: dict, ids: List[str]) -> Dict[str, List[AspectSentiment]]:
+        """Split a packed response into per-review results, skipping missing or malformed ids."""
+        parsed = {}
+        if not isinstance(result, dict):
+            return parsed
+
+        for review_id in ids:
+            entry = result.get(review_id)
+            if isinstance(entry, list):
+                entry = {'aspects': entry}
+            if not isinstance(entry, dict):
+                continue
+            try:
+                parsed[review_id] = self._parse_response(entry)
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+
+        return parsed
+
     def _parse_response(self, result: dict) -> List[AspectSentiment]:
         aspects_list = []
 
         for item in result.get('aspects', []):
-            aspects_list.append(AspectSentiment(
-                aspect=item['aspect'],
-                sentiment=item['sentiment'].lower(),
-                confidence=float(item['confidence']),
-                text_span=None
-            ))
-
-        return aspects_list
\ No newline at end of file
+            aspects_list.append(self._parse_item(item))
+
+        return aspects_list
+
+    def _parse_item(self, item: dict) -> AspectSentiment:
+        return AspectSentiment(
+            aspect=item['aspect'],
+            sentiment=item['sentiment'].lower(),
+            confidence=float(item['confidence']),
+            text_span=None
+        )
\ No newline at end of file
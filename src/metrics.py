@@ -0,0 +1,413 @@
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+MB = 1024 * 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process, or None where it can't be read."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / MB
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / MB
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process-lifetime RSS high-water mark, or None where it can't be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / MB if sys.platform == 'darwin' else peak / 1024
+
+
+# Two-sided 95% normal quantile used for the confidence intervals
+Z_95 = 1.959964
+
+
+def quantile_ci(sorted_values: List[float], q: float, z: float = Z_95) -> List[float]:
+    """
+    Distribution-free confidence interval for the q-quantile (0-1) of sorted samples.
+
+    Uses the order statistics whose ranks lie z binomial standard deviations
+    either side of n*q, so no assumption is made about the latency distribution.
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return [0.0, 0.0]
+    spread = z * math.sqrt(n * q * (1 - q))
+    lo = max(0, int(math.floor(n * q - spread)))
+    hi = min(n - 1, int(math.ceil(n * q + spread)))
+    return [float(sorted_values[lo]), float(sorted_values[hi])]
+
+
+@dataclass
+class CallRecord:
+    """Measurements of a single analyze() call"""
+    text_length: int
+    seconds: float  # median over the repeated runs in timings
+    aspects: int
+    confidences: List[float] = field(default_factory=list)
+    memory_mb: Optional[float] = None  # traced peak; None unless memory was profiled
+    words: int = 0  # whitespace-separated words in the text (not model tokens)
+    timings: List[float] = field(default_factory=list)
+
+
+@dataclass
+class CorpusRecording:
+    """
+    One pass of an analyzer over a corpus.
+
+    Every section of the metrics report is derived from this recording, so the
+    corpus is analyzed once per report. Recordings round-trip through JSON, which
+    allows rebuilding reports later without re-running inference.
+    """
+    analyzer: str
+    calls: List[CallRecord] = field(default_factory=list)
+    total_time: float = 0.0  # median over the repeated passes in run_times
+    startup: Optional[dict] = None
+    memory_profile: Optional[dict] = None
+    warmup: int = 0
+    repeat: int = 1
+    run_times: List[float] = field(default_factory=list)
+
+    # Word-count bins (lower edges) for latency_by_length()
+    LENGTH_BINS = (0, 25, 50, 100, 200, 400)
+
+    # ==================== REPORT SECTIONS ====================
+
+    def speed(self) -> Dict[str, float]:
+        if not self.calls:
+            return {
+                'total_time': 0.0,
+                'avg_time_per_text': 0.0,
+                'throughput_texts_per_second': 0.0,
+                'texts_processed': 0
+            }
+
+        n = len(self.calls)
+        latencies = sorted(call.seconds for call in self.calls)
+        mean = float(np.mean(latencies))
+        std = float(np.std(latencies, ddof=1)) if n > 1 else 0.0
+        half_width = Z_95 * std / math.sqrt(n)
+
+        return {
+            'total_time': self.total_time,
+            'avg_time_per_text': self.total_time / n,
+            'throughput_texts_per_second': n / self.total_time if self.total_time > 0 else 0.0,
+            'texts_processed': n,
+            'warmup': self.warmup,
+            'repeat': self.repeat,
+            'mean_latency': mean,
+            'std_latency': std,
+            'p50_latency': float(np.percentile(latencies, 50)),
+            'p90_latency': float(np.percentile(latencies, 90)),
+            'p99_latency': float(np.percentile(latencies, 99)),
+            'max_latency': latencies[-1],
+            # 95% intervals: normal approximation for the mean, order statistics for percentiles
+            'mean_latency_ci95': [max(0.0, mean - half_width), mean + half_width],
+            'p50_latency_ci95': quantile_ci(latencies, 0.50),
+            'p90_latency_ci95': quantile_ci(latencies, 0.90),
+            'p99_latency_ci95': quantile_ci(latencies, 0.99),
+            'by_length': self.latency_by_length()
+        }
+
+    def latency_by_length(self) -> Dict:
+        """
+        Per-text latency grouped by review length in whitespace-separated words,
+        plus a least-squares fit latency = intercept + per_word * words.
+        """
+        edges = list(self.LENGTH_BINS) + [math.inf]
+        bins = []
+        for lo, hi in zip(edges[:-1], edges[1:]):
+            latencies = [call.seconds for call in self.calls if lo <= call.words < hi]
+            if latencies:
+                bins.append({
+                    'min_words': lo,
+                    'max_words': hi if hi != math.inf else None,
+                    'count': len(latencies),
+                    'mean_latency': float(np.mean(latencies)),
+                    'p50_latency': float(np.percentile(latencies, 50)),
+                    'p90_latency': float(np.percentile(latencies, 90))
+                })
+
+        words = [call.words for call in self.calls]
+        fit = {'per_word_seconds': None, 'intercept_seconds': None}
+        if len(set(words)) > 1:
+            slope, intercept = np.polyfit(words, [call.seconds for call in self.calls], 1)
+            fit = {'per_word_seconds': float(slope), 'intercept_seconds': float(intercept)}
+
+        return {'bins': bins, **fit}
+
+    def aspects_detected(self) -> Dict[str, float]:
+        aspect_counts = [call.aspects for call in self.calls]
+
+        if not aspect_counts:
+            return {
+                'mean': 0.0,
+                'median': 0.0,
+                'std': 0.0,
+                'min': 0,
+                'max': 0,
+                'total': 0
+            }
+
+        return {
+            'mean': float(np.mean(aspect_counts)),
+            'median': float(np.median(aspect_counts)),
+            'std': float(np.std(aspect_counts)),
+            'min': int(min(aspect_counts)),
+            'max': int(max(aspect_counts)),
+            'total': int(sum(aspect_counts))
+        }
+
+    def avg_confidence(self) -> Dict[str, float]:
+        confidences = [c for call in self.calls for c in call.confidences]
+
+        if not confidences:
+            return {
+                'avg': 0.0,
+                'min': 0.0,
+                'max': 0.0,
+                'std': 0.0,
+                'total_aspects': 0
+            }
+
+        return {
+            'avg': float(np.mean(confidences)),
+            'min': float(min(confidences)),
+            'max': float(max(confidences)),
+            'std': float(np.std(confidences)),
+            'total_aspects': len(confidences)
+        }
+
+    def memory_usage(self) -> Optional[Dict[str, float]]:
+        """The traced/RSS memory profile, or None when the recording ran without profile_memory."""
+        if self.memory_profile is None:
+            return None
+        return dict(self.memory_profile)
+
+    def initialization(self) -> Dict[str, float]:
+        if self.startup is None:
+            return {'time_seconds': 0.0}
+        return {'time_seconds': self.startup['init_seconds'], **self.startup}
+
+    def report(self) -> Dict[str, Dict]:
+        """All metrics in the layout of ABSAAnalyzer.calculate_all_metrics()."""
+        return {
+            'speed': self.speed(),
+            'aspects_detected': self.aspects_detected(),
+            'avg_confidence': self.avg_confidence(),
+            'memory_usage': self.memory_usage(),
+            'initialization': self.initialization()
+        }
+
+    # ==================== SERIALIZATION ====================
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CorpusRecording':
+        return cls(
+            analyzer=data['analyzer'],
+            calls=[CallRecord(**call) for call in data.get('calls', [])],
+            total_time=data.get('total_time', 0.0),
+            startup=data.get('startup'),
+            memory_profile=data.get('memory_profile'),
+            warmup=data.get('warmup', 0),
+            repeat=data.get('repeat', 1),
+            run_times=data.get('run_times', [])
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'CorpusRecording':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class MemoryProfiler:
+    """
+    Measures memory of an analyzer while it processes texts.
+
+    Reports the tracemalloc peak of Python allocations (spaCy Docs, tokenizer
+    buffers, result objects), the process RSS and its high-water mark (which
+    also covers native allocations such as torch activations), per-stage
+    allocation deltas and, where the analyzer exposes it, the model
+    parameter/buffer footprint. Tracing slows Python code down noticeably,
+    so timings taken while profiling are not representative.
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self._stages = {}
+        self._call_peaks = []
+        self._was_tracing = False
+
+    def _stage_functions(self):
+        # spaCy-based analyzers split into parsing and aspect/sentiment stages
+        if hasattr(self.analyzer, '_parse') and hasattr(self.analyzer, '_analyze_doc'):
+            return [('parse', self.analyzer._parse), ('analyze_doc', self.analyzer._analyze_doc)]
+        return [('analyze', self.analyzer.analyze)]
+
+    def start(self) -> None:
+        gc.collect()
+        self._stages = {}
+        self._call_peaks = []
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start()
+        self._traced_start = tracemalloc.get_traced_memory()[0]
+        self._traced_peak = self._traced_start
+        self._rss_start = current_rss_mb()
+
+    def analyze(self, text: str):
+        """Analyze one text stage by stage; returns (results, peak MB allocated during the call)."""
+        call_start = tracemalloc.get_traced_memory()[0]
+        call_peak = 0
+        value = text
+
+        for name, func in self._stage_functions():
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            value = func(value)
+            after, peak = tracemalloc.get_traced_memory()
+
+            stats = self._stages.setdefault(name, {'calls': 0, 'net_mb': 0.0, 'peak_mb': 0.0})
+            stats['calls'] += 1
+            stats['net_mb'] += (after - before) / MB
+            stats['peak_mb'] = max(stats['peak_mb'], (peak - before) / MB)
+
+            call_peak = max(call_peak, peak - call_start)
+            self._traced_peak = max(self._traced_peak, peak)
+
+        self._call_peaks.append(call_peak / MB)
+        return value, call_peak / MB
+
+    def stop(self) -> Dict[str, float]:
+        traced_end = tracemalloc.get_traced_memory()[0]
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+        rss_end = current_rss_mb()
+        profile = {
+            'peak_memory_mb': (self._traced_peak - self._traced_start) / MB,
+            'avg_memory_per_text_mb': float(np.mean(self._call_peaks)) if self._call_peaks else 0.0,
+            'total_memory_mb': (traced_end - self._traced_start) / MB,
+            'rss_start_mb': self._rss_start,
+            'rss_end_mb': rss_end,
+            'rss_delta_mb': rss_end - self._rss_start if rss_end is not None and self._rss_start is not None else None,
+            # Process-lifetime high-water mark: includes model loading and earlier work
+            'rss_lifetime_peak_mb': peak_rss_mb(),
+            'stages': {
+                name: {
+                    'calls': stats['calls'],
+                    'avg_net_mb': stats['net_mb'] / stats['calls'],
+                    'peak_mb': stats['peak_mb']
+                }
+                for name, stats in self._stages.items()
+            }
+        }
+
+        footprint = getattr(self.analyzer, 'model_footprint', None)
+        if callable(footprint):
+            profile['model'] = footprint()
+
+        return profile
+
+    def profile(self, texts: Iterable[str]) -> Dict[str, float]:
+        self.start()
+        for text in texts:
+            self.analyze(text)
+        return self.stop()
+
+
+class MetricsCollector:
+    """Runs an analyzer over a corpus, recording timing, aspects, confidences and memory per call"""
+
+    def __init__(self, analyzer, profile_memory: bool = False, warmup: int = 0, repeat: int = 1):
+        """
+        Args:
+            analyzer: Analyzer to measure
+            profile_memory: Trace allocations and RSS in an extra untimed pass before the timed ones
+            warmup: Untimed analyze() calls (cycling over the texts) before measuring
+            repeat: Timed passes over the corpus; per-text latency is the median over passes
+        """
+        self.analyzer = analyzer
+        self.profile_memory = profile_memory
+        self.warmup = warmup
+        self.repeat = max(1, repeat)
+
+    def record(self, texts: Iterable[str]) -> CorpusRecording:
+        texts = list(texts)
+        recording = CorpusRecording(analyzer=self.analyzer.__class__.__name__,
+                                    warmup=self.warmup, repeat=self.repeat)
+
+        for i in range(self.warmup if texts else 0):
+            self.analyzer.analyze(texts[i % len(texts)])
+
+        # Tracing slows analysis down, so memory is measured in a pass of its own
+        memory = [None] * len(texts)
+        if self.profile_memory:
+            profiler = MemoryProfiler(self.analyzer)
+            profiler.start()
+            for i, text in enumerate(texts):
+                memory[i] = profiler.analyze(text)[1]
+            recording.memory_profile = profiler.stop()
+
+        for run in range(self.repeat):
+            run_time = 0.0
+            for i, text in enumerate(texts):
+                start = time.perf_counter()
+                results = self.analyzer.analyze(text)
+                elapsed = time.perf_counter() - start
+                run_time += elapsed
+
+                if run > 0:
+                    recording.calls[i].timings.append(elapsed)
+                    continue
+
+                recording.calls.append(CallRecord(
+                    text_length=len(text),
+                    seconds=elapsed,
+                    aspects=len(results),
+                    confidences=[float(r.confidence) for r in results],
+                    memory_mb=memory[i],
+                    words=len(text.split()),
+                    timings=[elapsed]
+                ))
+
+            recording.run_times.append(run_time)
+
+        for call in recording.calls:
+            call.seconds = float(np.median(call.timings))
+        recording.total_time = float(np.median(recording.run_times)) if recording.run_times else 0.0
+
+        return recording
+
+
+def compare_memory(analyzers: Dict[str, object], texts: List[str]) -> Dict[str, Dict]:
+    """Memory profile of several analyzers on the same texts, keyed by analyzer name."""
+    return {name: MemoryProfiler(analyzer).profile(texts) for name, analyzer in analyzers.items()}
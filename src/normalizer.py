@@ -0,0 +1,276 @@
+import re
+from typing import Dict
+
+from src.cache import LRUCache
+
+# Remove "what a/what's/what is" constructions
+_WHAT_RE = re.compile(
+    r'^what(\s+a|\s+an|\s+is|\'s)\s+',
+    re.IGNORECASE
+)
+
+# Remove leading descriptive adjectives
+_LEADING_ADJECTIVES_RE = re.compile(
+    r'^(great|fun|nice|good|bad|amazing|awesome|excellent|fantastic|wonderful|'
+    r'terrible|horrible|awful|poor|mediocre|decent|okay|ok|fine|'
+    r'little|local|best|worst|delicious|tasty|yummy|gross|nasty|'
+    r'cute|plain|simple|complex|complicated|basic|advanced|'
+    r'ample|sufficient|inadequate|excessive|moderate|'
+    r'strange|weird|odd|unusual|normal|typical|common|rare|'
+    r'near|close|far|distant|nearby|adjacent|'
+    r'constant|frequent|occasional|rare|continuous|'
+    r'long|short|brief|extended|lengthy|'
+    r'fresh|stale|old|new|recent|ancient|modern|'
+    r'truly|really|very|super|ultra|mega|extremely|'
+    r'made|handmade|homemade|hand-made|home-made|'
+    r'some|this|that|these|those|such|'
+    r'same|similar|different|identical|unique|'
+    r'many|much|few|little|several|numerous|'
+    r'about|around|approximately|roughly|nearly|'
+    r'any|each|every|all|both|either|neither|'
+    r'entire|whole|complete|full|partial|half|'
+    r'home|outdoor|indoor|inside|outside|'
+    r'typical|traditional|classic|modern|contemporary|'
+    r'american|asian|european|mexican|italian|chinese|japanese|'
+    r'private|public|personal|professional|'
+    r'festive|casual|formal|fancy|plain|'
+    r'picture|photo|instagram|'
+    r'perfect|imperfect|flawless|flawed|'
+    r'small|medium|large|huge|tiny|massive|enormous|gigantic|'
+    r'trendy|stylish|fashionable|outdated|modern|'
+    r'layered|stacked|piled|heaped|'
+    r'exceptionally|incredibly|unbelievably|remarkably|'
+    r'insanely|crazy|wildly|ridiculously|absurdly|'
+    r'pretty|fairly|rather|quite|somewhat|slightly|'
+    r'real|fake|authentic|genuine|artificial|synthetic|'
+    r'female|male|unisex|gender|'
+    r'biggest|smallest|largest|tiniest|hugest|'
+    r'flat|round|square|circular|rectangular|'
+    r'out|super|extra|double|triple|single|'
+    r'regular|normal|standard|ordinary|usual|special|'
+    r'original|copy|replica|duplicate|'
+    r'yummy|delish|scrumptious|divine|heavenly|'
+    r'sounding|looking|seeming|appearing|'
+    r'delicate|robust|strong|weak|mild|intense|'
+    r'lightly|heavily|moderately|slightly|'
+    r'cool|warm|hot|cold|frozen|chilled|'
+    r'perfect|ideal|optimal|suboptimal|'
+    r'bit|various|assorted|mixed|varied|diverse|'
+    r'only|sole|single|lone|solitary|'
+    r'tiny|minuscule|microscopic|giant|colossal|'
+    r'plus|minus|positive|negative|'
+    r'surprising|expected|unexpected|predictable|'
+    r'surprisingly|unexpectedly|predictably|'
+    r'popular|unpopular|famous|unknown|obscure|'
+    r'simple|easy|difficult|hard|challenging|'
+    r'limited|unlimited|restricted|unrestricted|'
+    r'new|old|ancient|modern|contemporary|vintage|'
+    r'hard|soft|firm|tender|tough|gentle|'
+    r'chewy|crunchy|crispy|smooth|creamy|'
+    r'polite|rude|courteous|discourteous|respectful|'
+    r'expressive|bland|boring|exciting|dull|'
+    r'subtle|obvious|apparent|hidden|'
+    r'distinct|indistinct|clear|vague|'
+    r'earthy|airy|light|heavy|dense|'
+    r'speedy|slow|fast|quick|rapid|sluggish|'
+    r'friendly|unfriendly|warm|welcoming|hostile|'
+    r'wide|narrow|broad|slim|thick|thin|'
+    r'affordable|expensive|cheap|pricey|costly|'
+    r'fantastic|terrible|horrible|wonderful|'
+    r'impressed|disappointed|satisfied|unsatisfied|'
+    r'whole|entire|complete|partial|incomplete|'
+    r'aromatic|fragrant|smelly|odorless|'
+    r'buggy|glitchy|smooth|seamless|'
+    r'slow|fast|quick|rapid|speedy|'
+    r'cute|adorable|charming|lovely|'
+    r'little|small|tiny|miniature|petite|'
+    r'tasty|flavorful|bland|tasteless|'
+    r'fun|boring|entertaining|dull|'
+    r'overall|general|specific|particular|'
+    r'decent|acceptable|satisfactory|unsatisfactory|'
+    r'quick|rapid|swift|slow|leisurely|'
+    r'young|old|elderly|youthful|aged|'
+    r'fabulous|marvelous|spectacular|magnificent|'
+    r'hand|manual|automatic|mechanical|'
+    r'dense|sparse|concentrated|diluted|'
+    r'creamy|watery|liquid|solid|'
+    r'sweet|sour|bitter|salty|savory|umami|'
+    r'quickly|slowly|rapidly|gradually|'
+    r'big|large|huge|enormous|gigantic|'
+    r'ol|ole|old)\s+',
+    re.IGNORECASE
+)
+
+# Remove leading articles
+_ARTICLES_RE = re.compile(
+    r'^(a|an|the)\s+',
+    re.IGNORECASE
+)
+
+# Remove leading possessives/pronouns
+_POSSESSIVES_RE = re.compile(
+    r'^(my|their|our|your|his|her|its|one of|some of|all of|most of|many of|few of|several of)\s+',
+    re.IGNORECASE
+)
+
+# Remove leading intensifiers + adjectives
+_INTENSIFIED_ADJECTIVES_RE = re.compile(
+    r'^(very|really|so|super|quite|extremely|incredibly|unbelievably|'
+    r'too|way|pretty|fairly|rather|somewhat|slightly|'
+    r'a bit|a little|kind of|sort of|lot of|lots of|'
+    r'even though|although|though|however|but|yet|still|'
+    r'much|more|most|less|least|fewer|fewest|'
+    r'absolutely|totally|completely|entirely|utterly|thoroughly|'
+    r'both|either|neither|all|any|some|each|every|'
+    r'always|never|sometimes|often|rarely|seldom|frequently|'
+    r'especially|particularly|specifically|generally|usually)\s+'
+    r'(good|bad|tasty|nice|sweet|bitter|sour|salty|savory|'
+    r'delicious|gross|nasty|yummy|bland|flavorful|'
+    r'friendly|rude|polite|courteous|helpful|unhelpful|'
+    r'artificial|natural|real|fake|authentic|genuine|'
+    r'cute|adorable|lovely|beautiful|ugly|hideous|'
+    r'clean|dirty|messy|tidy|neat|organized|'
+    r'soft|hard|firm|tender|tough|chewy|crunchy|'
+    r'watery|creamy|smooth|chunky|lumpy|'
+    r'rude|polite|kind|mean|nice|nasty|'
+    r'fast|slow|quick|rapid|sluggish|speedy|'
+    r'expensive|cheap|affordable|pricey|costly|'
+    r'fresh|stale|old|new|rotten|spoiled)\s+',
+    re.IGNORECASE
+)
+
+# Remove remaining single intensifiers
+_INTENSIFIERS_RE = re.compile(
+    r'^(very|really|so|super|quite|extremely|incredibly|unbelievably|'
+    r'too|way|pretty|fairly|rather|somewhat|slightly|'
+    r'a bit|a little|kind of|sort of|lot of|lots of|plenty of|'
+    r'even though|although|though|however|but|yet|still|nevertheless|'
+    r'much|more|most|less|least|fewer|fewest|'
+    r'absolutely|totally|completely|entirely|utterly|thoroughly|fully|'
+    r'both|either|neither|all|any|some|each|every|another|other|'
+    r'always|never|sometimes|often|rarely|seldom|frequently|occasionally|'
+    r'especially|particularly|specifically|generally|usually|normally|typically)\s+',
+    re.IGNORECASE
+)
+
+# Remove temporal/season descriptors
+_TEMPORAL_RE = re.compile(
+    r'^(fall|winter|spring|summer|autumn|seasonal|'
+    r'season|special|featured|rotating|limited|exclusive|'
+    r'near|nearby|close|far|distant|'
+    r'constant|frequent|occasional|rare|'
+    r'late|early|mid|'
+    r'night|day|morning|afternoon|evening|'
+    r'daily|weekly|monthly|yearly|annual)\s+',
+    re.IGNORECASE
+)
+
+# Remove "small town/ice cream/bubble tea" before nouns
+_SIZE_AND_CATEGORY_RE = re.compile(
+    r'^(small\s+town|big\s+city|small|medium|large|huge|tiny|'
+    r'ice\s+cream|bubble\s+tea|boba\s+tea|sweet\s+tea|iced\s+tea|'
+    r'foot|hand|finger|body)\s+',
+    re.IGNORECASE
+)
+
+# Remove business names
+_BUSINESS_NAMES_RE = re.compile(
+    r'^(dairy\s+barn|sidney\s+dairy\s+barn|rewind|dripps|'
+    r'baskin\s+robbins|cold\s+stone|marble\s+slab|'
+    r'ben\s+jerry|haagen\s+dazs)\s*',
+    re.IGNORECASE
+)
+
+# Remove corporate/local/vegan/artisanal descriptors
+_DESCRIPTORS_RE = re.compile(
+    r'^(corporate|chain|franchise|franchised|'
+    r'local|locally|regional|national|international|'
+    r'vegan|vegetarian|non\s+vegan|non-vegan|'
+    r'organic|natural|artificial|synthetic|'
+    r'fresh|stale|frozen|chilled|'
+    r'artisanal|gourmet|premium|luxury|basic|standard|'
+    r'hard\s+scoop|soft\s+serve|'
+    r'hand\s+made|handmade|hand-made|'
+    r'home\s+made|homemade|home-made|'
+    r'house\s+made|housemade|house-made)\s+',
+    re.IGNORECASE
+)
+
+# Remove price/online indicators
+_PRICE_ONLINE_RE = re.compile(
+    r'^(1970s|1980s|1990s|2000s|retro|vintage|classic|'
+    r'cheap|expensive|pricey|costly|affordable|reasonable|'
+    r'pricier|cheaper|budget|premium|'
+    r'online|offline|digital|virtual|physical|'
+    r'takeout|take-out|dine-in|dine\s+in|delivery)\s+',
+    re.IGNORECASE
+)
+
+# Remove "with" constructions like "with mix-ins"
+_WITH_CLAUSE_RE = re.compile(r'\s+with\s+.*$', re.IGNORECASE)
+
+# Remove "for" constructions like "for dessert"
+_FOR_CLAUSE_RE = re.compile(r'\s+for\s+.*$', re.IGNORECASE)
+
+_TRAILING_PUNCT_RE = re.compile(r'[^\w\s]+$')
+_QUOTES_RE = re.compile(r'^["\']|["\']$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Applied once each and in this order; each removal can expose the next prefix
+_STRIP_PATTERNS = (
+    _WHAT_RE,
+    _LEADING_ADJECTIVES_RE,
+    _ARTICLES_RE,
+    _POSSESSIVES_RE,
+    _INTENSIFIED_ADJECTIVES_RE,
+    _INTENSIFIERS_RE,
+    _TEMPORAL_RE,
+    _SIZE_AND_CATEGORY_RE,
+    _BUSINESS_NAMES_RE,
+    _DESCRIPTORS_RE,
+    _PRICE_ONLINE_RE,
+    _WITH_CLAUSE_RE,
+    _FOR_CLAUSE_RE,
+)
+
+
+class AspectNormalizer:
+    """
+    Precompiled aspect normalizer with a bounded LRU keyed on the raw aspect text.
+
+    The same aspect strings are normalized many times per review (validation,
+    extraction, coordination merging, dedupe, result building), so results are memoized.
+    """
+
+    def __init__(self, maxsize: int = 50000):
+        self._cache = LRUCache(maxsize)
+
+    def __call__(self, aspect_text: str) -> str:
+        text = self._cache.get(aspect_text)
+        if text is None:
+            text = self.normalize(aspect_text)
+            self._cache.put(aspect_text, text)
+        return text
+
+    @staticmethod
+    def normalize(aspect_text: str) -> str:
+        """Remove possessives/pronouns/leading modifiers and trailing punctuation (uncached)."""
+        text = aspect_text.strip().lower()
+
+        for pattern in _STRIP_PATTERNS:
+            text = pattern.sub('', text)
+
+        # Strip trailing punctuation
+        text = _TRAILING_PUNCT_RE.sub('', text)
+
+        # Remove leading/trailing quotes
+        text = _QUOTES_RE.sub('', text)
+
+        # Collapse whitespace
+        return _WHITESPACE_RE.sub(' ', text).strip()
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+
+    def cache_stats(self) -> Dict[str, float]:
+        return self._cache.stats()
@@ -0,0 +1,39 @@
+"""
+Reading review texts from CSV and JSONL files.
+"""
+import contextlib
+import csv
+import json
+import sys
+from typing import Iterator
+
+
+def read_reviews(path: str, fmt: str = 'auto', text_column: str = 'Review Text',
+                 text_field: str = 'text') -> Iterator[str]:
+    """
+    Yield review texts from a CSV or JSONL file ('-' reads stdin).
+
+    CSV rows are read from text_column. JSONL lines may be plain JSON strings
+    or objects, whose text_field is used. Missing values yield ''.
+    """
+    if fmt == 'auto':
+        fmt = 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+    # utf-8-sig strips the byte order mark the bundled CSV starts with
+    with (contextlib.nullcontext(sys.stdin) if path == '-' else
+          open(path, 'r', encoding='utf-8-sig', newline='')) as f:
+        if fmt == 'csv':
+            csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+            reader = csv.DictReader(f)
+            if reader.fieldnames is not None and text_column not in reader.fieldnames:
+                raise ValueError(f"Column '{text_column}' not found in {path}; columns: {reader.fieldnames}")
+            for row in reader:
+                yield row.get(text_column) or ''
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    record = record.get(text_field)
+                yield record or ''
@@ -0,0 +1,91 @@
+import importlib
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+sys.path.insert(0, '.')
+from src.base import AspectSentiment
+
+# Short names accepted wherever an analyzer spec ('module:Class') is expected
+ANALYZERS = {
+    'lexicon': 'src.lexicon_absa:LexiconABSA',
+    'transformer': 'src.transformer_absa:TransformerABSA',
+    'llm': 'src.llm_absa:LLMABSA',
+    'cascade': 'src.cascade_absa:CascadeABSA',
+}
+
+# Analyzer loaded once per worker process by _init_worker
+_worker_analyzer = None
+
+
+def load_analyzer(spec: str, analyzer_kwargs: Optional[dict] = None):
+    """Construct an analyzer from a short name ('lexicon') or a 'module:Class' spec."""
+    module_name, _, class_name = ANALYZERS.get(spec, spec).partition(':')
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls(**(analyzer_kwargs or {}))
+
+
+def _init_worker(spec: str, analyzer_kwargs: Optional[dict], torch_threads: Optional[int]) -> None:
+    global _worker_analyzer
+    if torch_threads:
+        # Bounds the OpenMP/MKL pools if torch is first imported by the analyzer below
+        os.environ['OMP_NUM_THREADS'] = str(torch_threads)
+        os.environ['MKL_NUM_THREADS'] = str(torch_threads)
+
+    _worker_analyzer = load_analyzer(spec, analyzer_kwargs)
+
+    # Covers workers forked from a parent that had already imported torch
+    if torch_threads and 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(torch_threads)
+
+
+def _analyze_chunk(texts: List[str]) -> List[List[AspectSentiment]]:
+    return _worker_analyzer.analyze_batch(texts, batch_size=len(texts) or 1)
+
+
+def run_corpus(analyzer: str, texts: Iterable[str], workers: Optional[int] = None,
+               chunk_size: int = 64, torch_threads: Optional[int] = 1,
+               analyzer_kwargs: Optional[dict] = None, max_pending_chunks: Optional[int] = None,
+               mp_context=None) -> Iterator[List[AspectSentiment]]:
+    """
+    Analyze a corpus across worker processes, yielding results in input order.
+
+    Each worker loads its own analyzer once (through the pool initializer) and
+    processes chunks of chunk_size texts with analyze_batch. Input is consumed
+    lazily: at most max_pending_chunks chunks are in flight at a time.
+
+    Args:
+        analyzer: Short name ('lexicon', 'transformer', ...) or 'module:Class' spec
+        texts: Input texts (any iterable, consumed lazily)
+        workers: Number of worker processes (default: os.cpu_count())
+        chunk_size: Texts per task sent to a worker
+        torch_threads: torch intra-op threads per worker (None leaves the default)
+        analyzer_kwargs: Constructor arguments for the analyzer
+        max_pending_chunks: In-flight chunk limit (default: 2 per worker)
+        mp_context: multiprocessing context, e.g. multiprocessing.get_context('spawn')
+
+    Yields:
+        One list of AspectSentiment objects per input text
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending_chunks = max_pending_chunks or 2 * workers
+    texts = iter(texts)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_init_worker,
+                             initargs=(analyzer, analyzer_kwargs, torch_threads)) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < max_pending_chunks:
+                chunk = list(islice(texts, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_analyze_chunk, chunk))
+
+            if not pending:
+                return
+
+            yield from pending.popleft().result()
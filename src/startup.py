@@ -0,0 +1,108 @@
+"""
+Startup profiling for ABSA analyzers.
+
+Cold numbers are measured in a fresh Python subprocess, so nothing is imported
+or loaded yet; warm numbers construct a second instance in the current process.
+
+    python -m src.startup src.lexicon_absa LexiconABSA
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SAMPLE_TEXT = "The pizza was delicious but the service was terrible."
+
+
+def measure_startup(module: str, class_name: str, sample_text: str = DEFAULT_SAMPLE_TEXT,
+                    steady_state_runs: int = 5, analyzer_kwargs: Optional[dict] = None) -> Dict:
+    """
+    Time import, construction (per component), first inference and steady-state inference.
+
+    Runs in the calling process; use profile_startup() for true cold numbers.
+    """
+    start = time.perf_counter()
+    cls = getattr(importlib.import_module(module), class_name)
+    import_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer = cls(**(analyzer_kwargs or {}))
+    init_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer.analyze(sample_text)
+    first_inference_seconds = time.perf_counter() - start
+
+    steady = []
+    for _ in range(steady_state_runs):
+        start = time.perf_counter()
+        analyzer.analyze(sample_text)
+        steady.append(time.perf_counter() - start)
+    steady_state_seconds = statistics.median(steady) if steady else first_inference_seconds
+
+    return {
+        'import_seconds': import_seconds,
+        'init_seconds': init_seconds,
+        'components': dict(getattr(analyzer, 'load_times', {})),
+        'first_inference_seconds': first_inference_seconds,
+        'steady_state_seconds': steady_state_seconds,
+        'warmup_overhead_seconds': max(0.0, first_inference_seconds - steady_state_seconds),
+        'time_to_first_result_seconds': import_seconds + init_seconds + first_inference_seconds
+    }
+
+
+def profile_startup(module: str, class_name: str, sample_text: str = DEFAULT_SAMPLE_TEXT,
+                    steady_state_runs: int = 5, analyzer_kwargs: Optional[dict] = None,
+                    warm: bool = True, timeout: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Cold startup breakdown from a fresh subprocess, plus a warm in-process measurement.
+
+    Args:
+        module: Module defining the analyzer, e.g. 'src.lexicon_absa'
+        class_name: Analyzer class name, e.g. 'LexiconABSA'
+        sample_text: Text used for first-inference and steady-state timing
+        steady_state_runs: Number of repeated calls the steady-state median is taken over
+        analyzer_kwargs: JSON-serializable constructor arguments
+        warm: Also measure a second construction in this process
+        timeout: Subprocess timeout in seconds
+
+    Returns:
+        {'cold': {...}, 'warm': {...}} with the keys of measure_startup()
+    """
+    command = [
+        sys.executable, '-m', 'src.startup', module, class_name,
+        '--text', sample_text,
+        '--runs', str(steady_state_runs),
+        '--kwargs', json.dumps(analyzer_kwargs or {})
+    ]
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True,
+                               timeout=timeout, check=True)
+    profile = {'cold': json.loads(completed.stdout.strip().splitlines()[-1])}
+
+    if warm:
+        profile['warm'] = measure_startup(module, class_name, sample_text, steady_state_runs, analyzer_kwargs)
+
+    return profile
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Measure analyzer startup in this (fresh) process.")
+    parser.add_argument('module')
+    parser.add_argument('class_name')
+    parser.add_argument('--text', default=DEFAULT_SAMPLE_TEXT)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--kwargs', default='{}')
+    args = parser.parse_args(argv)
+
+    result = measure_startup(args.module, args.class_name, args.text, args.runs, json.loads(args.kwargs))
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
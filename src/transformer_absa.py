@@ -1,79 +1,307 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
 import torch
-from typing import List
+import os
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
 import sys
-import re
 
 sys.path.insert(0, '.')
 from src.base import ABSAAnalyzer, AspectSentiment
+from src.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+from src.evaluation import load_gold
+from src.inference_backends import DEFAULT_GOLD_PATH, load_backend
 from src.utils import AspectExtractionMixin
 
+# Texts the fast tokenizer must encode exactly like the slow one before it is used:
+# accents, curly quotes, emoji, digits/units, contractions, odd spacing and casing
+_TOKENIZER_PROBES = (
+    "The pizza was delicious but the service was terrible.",
+    "Crème brûlée & café au lait — “amazing”, 10/10!!",
+    "Wasn't great... didn't LOVE it :( 😋🍕 $12.50 for 2 slices",
+    "  Staff   were\tfriendly;  the fish-and-chips (cod) weren't.  ",
+    "Ramen 拉麵 und Spätzle, naïve façade, 3rd visit @ 7pm #yum",
+)
+
 
 class TransformerABSA(AspectExtractionMixin, ABSAAnalyzer):
-    def __init__(self, model_name="yangheng/deberta-v3-base-absa-v1.1"):
+    def __init__(self, model_name="yangheng/deberta-v3-base-absa-v1.1",
+                 max_batch_size=32, max_tokens_per_batch=8192,
+                 cache_size=10000, cache_path=None, cache_max_entries=1000000, nlp=None,
+                 backend='fp32', backend_cache_dir=None, backend_threads=None,
+                 use_fast_tokenizer=False, token_cache_size=10000, max_length=512,
+                 local_files_only=False):
+        if nlp is not None:
+            self.nlp = nlp  # share an already loaded spaCy pipeline
         AspectExtractionMixin.__init__(self)
+        self.model_name = model_name
 
+        start = time.perf_counter()
+        # local_files_only: load from the Hugging Face cache, never from the hub
+        self.local_files_only = local_files_only
         self.tokenizer = AutoTokenizer.from_pretrained(
             model_name,
-            use_fast=False
+            use_fast=False,
+            local_files_only=local_files_only
         )
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
-        self.model.eval()
+        self.load_times['tokenizer'] = time.perf_counter() - start
+
+        # Reviews and aspects are encoded separately (each distinct string once)
+        # and assembled into pair inputs with the model's special tokens. With
+        # use_fast_tokenizer, the fast tokenizer encodes them if it reproduces the
+        # slow tokenizer's ids on the probe texts and every gold review.
+        self.max_length = max_length
+        self.sequence_tokenizer = self.tokenizer
+        if use_fast_tokenizer:
+            start = time.perf_counter()
+            self.sequence_tokenizer = self._matching_fast_tokenizer(model_name) or self.tokenizer
+            self.load_times['fast_tokenizer'] = time.perf_counter() - start
+        self.token_cache = LRUCache(token_cache_size)
+        self._pair_special_tokens = self.tokenizer.num_special_tokens_to_add(pair=True)
+
+        # 'fp32' (eager PyTorch), 'int8' (dynamic quantization) or 'onnx' (ONNX Runtime);
+        # quantized models and exported graphs are cached under backend_cache_dir
+        start = time.perf_counter()
+        self.backend = load_backend(backend, model_name, self.tokenizer,
+                                    cache_dir=backend_cache_dir, num_threads=backend_threads,
+                                    local_files_only=local_files_only)
+        self.load_times['model'] = time.perf_counter() - start
 
         self.id2label = {0: 'negative', 1: 'neutral', 2: 'positive'}
 
-    def analyze(self, text: str) -> List[AspectSentiment]:
-        text = re.sub(r'\([^)]*\)', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-
-        doc = self.nlp(text)
-
-        # Extract raw candidates
-        candidates = self._extract_aspects(doc)  # From mixin
-
-        # Merge coordinated aspects like "cookies and creme ice cream"
-        merged = self._merge_coordinated_aspects(candidates, doc, text)
-
-        # Normalize & dedupe
-        normalized = []
-        seen = set()
-        for c in merged:
-            norm = self._normalize_aspect(self._get_text(c)).lower()
-            if norm not in seen and norm:
-                normalized.append(c)
-                seen.add(norm)
-
-        results = []
-        for aspect in normalized:
-            normalized_text = self._normalize_aspect(self._get_text(aspect))
-            sentiment_info = self._classify_aspect_sentiment(text, normalized_text)
-            if sentiment_info:
-                results.append(AspectSentiment(
-                    aspect=normalized_text,
-                    sentiment=sentiment_info['label'],
-                    confidence=sentiment_info['score'],
-                    text_span=(self._get_start_char(aspect), self._get_end_char(aspect))
-                ))
-
-        return results
+        # Upper bounds for one forward pass: number of (text, aspect) pairs and
+        # padded tokens (pairs in the batch * longest pair).
+        self.max_batch_size = max_batch_size
+        self.max_tokens_per_batch = max_tokens_per_batch
+
+        # (text, aspect) predictions keyed by model configuration + pair hash; hits
+        # skip tokenization and the forward pass entirely. Anything that can change
+        # the model inputs or outputs (backend, tokenizer, truncation) is part of
+        # the namespace, so predictions of different configurations never mix.
+        tokenizer_mode = 'fast' if self.sequence_tokenizer is not self.tokenizer else 'slow'
+        self.cache_namespace = f"{model_name}|{backend}|{tokenizer_mode}|{max_length}"
+        disk_cache = SQLiteCache(cache_path, max_entries=cache_max_entries) if cache_path else None
+        self.cache = TieredCache(LRUCache(cache_size), disk_cache)
+
+    @property
+    def model(self):
+        """The PyTorch module behind the fp32/int8 backends (None for ONNX Runtime)."""
+        return getattr(self.backend, 'model', None)
+
+    def model_footprint(self) -> Dict[str, float]:
+        """Size of the model's weights as loaded (not counting activations), per backend."""
+        return self.backend.footprint()
+
+    def _analyze_doc(self, doc) -> List[AspectSentiment]:
+        return self._analyze_docs([doc])[0]
+
+    def analyze_stream(self, texts: Iterable[str], batch_size: int = 64,
+                       n_process: int = 1) -> Iterator[List[AspectSentiment]]:
+        # Pairs of every review in a chunk share the same padded mini-batches
+        docs = self._parse_stream(texts, batch_size=batch_size, n_process=n_process)
+        while True:
+            chunk = list(islice(docs, batch_size))
+            if not chunk:
+                return
+            with self.instrumentation.stage('analyze_docs'):
+                results = self._analyze_docs(chunk)
+            yield from results
+
+    def _analyze_docs(self, docs) -> List[List[AspectSentiment]]:
+        """Classify the aspects of several parsed reviews with batched forward passes."""
+        per_doc = []
+        pairs = []
+        for doc in docs:
+            aspects = []
+            for aspect in self._get_candidate_aspects(doc):  # From mixin
+                normalized_text = self._normalize_aspect(self._get_text(aspect))
+                aspects.append((normalized_text, aspect))
+                pairs.append((doc.text, normalized_text))
+            per_doc.append(aspects)
+
+        predictions = iter(self._classify_pairs(pairs))
+
+        all_results = []
+        for aspects in per_doc:
+            results = []
+            for normalized_text, aspect in aspects:
+                sentiment_info = next(predictions)
+                if sentiment_info:
+                    results.append(AspectSentiment(
+                        aspect=normalized_text,
+                        sentiment=sentiment_info['label'],
+                        confidence=sentiment_info['score'],
+                        text_span=(self._get_start_char(aspect), self._get_end_char(aspect))
+                    ))
+            all_results.append(results)
+
+        return all_results
 
     def _classify_aspect_sentiment(self, text: str, aspect: str):
-        inputs = self.tokenizer(
-            text,
-            aspect,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512
-        )
+        return self._classify_pairs([(text, aspect)])[0]
+
+    def _classify_pairs(self, pairs: List[Tuple[str, str]]) -> List[dict]:
+        """Classify (text, aspect) pairs, serving repeats from the cache."""
+        predictions = [None] * len(pairs)
+
+        pending = {}
+        for i, (text, aspect) in enumerate(pairs):
+            key = make_cache_key(self.cache_namespace, text, aspect)
+            cached = self.cache.get(key)
+            if cached is not None:
+                predictions[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        # Hits and misses are counted per pair (they sum to 'pairs'); repeated pairs
+        # within one call still reach the model only once
+        misses = sum(len(ids) for ids in pending.values())
+        instrumentation = self.instrumentation
+        instrumentation.count('pairs', len(pairs))
+        instrumentation.count('cache_hits', len(pairs) - misses)
+        instrumentation.count('cache_misses', misses)
+
+        if pending:
+            keys = list(pending)
+            computed = self._run_model([pairs[pending[key][0]] for key in keys])
+            self.cache.put_many(zip(keys, computed))
+            for key, prediction in zip(keys, computed):
+                for i in pending[key]:
+                    predictions[i] = prediction
+
+        return predictions
+
+    def _run_model(self, pairs: List[Tuple[str, str]]) -> List[dict]:
+        """Label and confidence of each (text, aspect) pair."""
+        if not pairs:
+            return []
+
+        confidences, labels = torch.max(self._class_probabilities(pairs), dim=-1)
+        return [{'label': self.id2label[label], 'score': confidence}
+                for label, confidence in zip(labels.tolist(), confidences.tolist())]
+
+    def _class_probabilities(self, pairs: List[Tuple[str, str]]) -> torch.Tensor:
+        """Class probabilities of (text, aspect) pairs from length-bucketed, padded mini-batches."""
+        probabilities = torch.zeros(len(pairs), len(self.id2label))
+        if not pairs:
+            return probabilities
+
+        instrumentation = self.instrumentation
+        with instrumentation.stage('tokenize'):
+            encodings = self._encode_pairs(pairs)
+        lengths = [len(enc['input_ids']) for enc in encodings]
+
+        for batch in self._make_batches(lengths):
+            inputs = self.tokenizer.pad([encodings[i] for i in batch], return_tensors="pt")
+
+            with instrumentation.stage('forward'):
+                probabilities[batch] = torch.softmax(self.backend.logits(inputs), dim=-1)
+            instrumentation.count('batches')
+
+        return probabilities
+
+    def _matching_fast_tokenizer(self, model_name: str):
+        """
+        The fast tokenizer for model_name if it encodes the probe texts and the
+        reviews of data/tests.json exactly like the slow one, else None.
+        """
+        try:
+            fast = AutoTokenizer.from_pretrained(model_name, use_fast=True,
+                                                 local_files_only=self.local_files_only)
+        except Exception:  # no tokenizer.json and no converter for this model
+            return None
+        if not getattr(fast, 'is_fast', False):
+            return None
+
+        texts = list(_TOKENIZER_PROBES)
+        if os.path.exists(DEFAULT_GOLD_PATH):
+            texts.extend(self._prepare_text(entry['text']) for entry in load_gold(DEFAULT_GOLD_PATH))
+        for text in texts:
+            if (fast.encode(text, add_special_tokens=False, verbose=False) !=
+                    self.tokenizer.encode(text, add_special_tokens=False, verbose=False)):
+                return None
+        return fast
+
+    def _sequence_ids(self, sequences: List[str]) -> Dict[str, List[int]]:
+        """Token ids (no special tokens) of each distinct sequence; unseen ones are encoded in one call."""
+        ids = {}
+        missing = []
+        for sequence in dict.fromkeys(sequences):
+            cached = self.token_cache.get(sequence)
+            if cached is None:
+                missing.append(sequence)
+            else:
+                ids[sequence] = cached
+
+        if missing:
+            # verbose=False: full reviews may exceed max_length before pair truncation
+            encoded = self.sequence_tokenizer(missing, add_special_tokens=False, verbose=False)['input_ids']
+            for sequence, sequence_ids in zip(missing, encoded):
+                ids[sequence] = sequence_ids
+                self.token_cache.put(sequence, sequence_ids)
+            self.instrumentation.count('sequences_encoded', len(missing))
+
+        return ids
+
+    def _encode_pairs(self, pairs: List[Tuple[str, str]]) -> List[dict]:
+        """
+        Model inputs of (text, aspect) pairs, identical to
+        tokenizer(text, aspect, truncation=True, max_length=max_length).
+        """
+        ids = self._sequence_ids([sequence for pair in pairs for sequence in pair])
+        return [self._pair_encoding(ids[text], ids[aspect]) for text, aspect in pairs]
+
+    def _pair_encoding(self, ids: List[int], pair_ids: List[int]) -> dict:
+        excess = len(ids) + len(pair_ids) + self._pair_special_tokens - self.max_length
+        if excess > 0:
+            ids, pair_ids = _truncate_longest_first(ids, pair_ids, excess)
+
+        tokenizer = self.tokenizer
+        input_ids = tokenizer.build_inputs_with_special_tokens(ids, pair_ids)
+        encoding = {'input_ids': input_ids}
+        if 'token_type_ids' in tokenizer.model_input_names:
+            encoding['token_type_ids'] = tokenizer.create_token_type_ids_from_sequences(ids, pair_ids)
+        encoding['attention_mask'] = [1] * len(input_ids)
+        return encoding
+
+    def _make_batches(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Group pair indices into mini-batches sorted by token length.
+
+        Sorting keeps similarly sized pairs together so little compute is spent
+        on padding; a batch is closed when adding the next (longest so far) pair
+        would exceed max_batch_size or max_tokens_per_batch.
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+
+        batches = []
+        current = []
+        for i in order:
+            padded_tokens = (len(current) + 1) * lengths[i]
+            if current and (len(current) >= self.max_batch_size or
+                            padded_tokens > self.max_tokens_per_batch):
+                batches.append(current)
+                current = []
+            current.append(i)
+
+        if current:
+            batches.append(current)
+
+        return batches
+
 
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            probs = torch.softmax(logits, dim=-1)
-            prediction = torch.argmax(probs, dim=-1).item()
-            confidence = probs[0][prediction].item()
-
-        return {
-            'label': self.id2label[prediction],
-            'score': confidence
-        }
\ No newline at end of file
+def _truncate_longest_first(ids: List[int], pair_ids: List[int], excess: int) -> Tuple[List[int], List[int]]:
+    """
+    Drop excess tokens from the ends of two sequences the way the 'longest_first'
+    truncation strategy does: from the longer one until both are equally long,
+    then alternately, starting with the second sequence.
+    """
+    first_remove = min(abs(len(pair_ids) - len(ids)), excess)
+    second_remove = excess - first_remove
+    if len(ids) > len(pair_ids):
+        ids_remove = first_remove + second_remove // 2
+        pair_remove = second_remove - second_remove // 2
+    else:
+        ids_remove = second_remove // 2
+        pair_remove = first_remove + second_remove - second_remove // 2
+    return ids[:len(ids) - ids_remove], pair_ids[:len(pair_ids) - pair_remove]
@@ -0,0 +1,213 @@
+"""
+VADER compound scores without re-tokenizing and re-lowercasing every context.
+
+SentimentIntensityAnalyzer.polarity_scores() rebuilds a lowercased copy of the
+whole word list for every rule check of every word, which makes each call
+quadratic in the context length, and LexiconABSA scores the same sentence again
+for every aspect in it. ValenceScorer applies the same rules (lexicon valence,
+"no" handling, ALL-CAPS emphasis, boosters/dampeners, negation, special idioms,
+"least", "but" and punctuation emphasis) over per-word features that are
+computed once per distinct word, and LexiconABSA memoizes sentence scores per
+Doc. Compound scores are identical to polarity_scores(); contexts containing
+emoji are passed to VADER itself, which rewrites them before scoring.
+"""
+import math
+import string
+from typing import List, Sequence
+
+from vaderSentiment.vaderSentiment import (BOOSTER_DICT, C_INCR, NEGATE, N_SCALAR, SPECIAL_CASES,
+                                           SentimentIntensityAnalyzer)
+
+from src.cache import LRUCache
+
+_NEGATE = frozenset(NEGATE)
+
+
+class _Word:
+    """Scoring-relevant properties of one whitespace-separated word"""
+    __slots__ = ('word', 'lower', 'is_upper', 'valence', 'booster', 'negation')
+
+    def __init__(self, raw: str, lexicon: dict):
+        # Strip surrounding punctuation unless that leaves an emoticon-sized remainder
+        stripped = raw.strip(string.punctuation)
+        word = stripped if len(stripped) > 2 else raw
+        lower = word.lower()
+        self.word = word
+        self.lower = lower
+        self.is_upper = word.isupper()
+        self.valence = lexicon.get(lower)  # None when not in the lexicon
+        self.booster = BOOSTER_DICT.get(lower)
+        self.negation = lower in _NEGATE or "n't" in lower
+
+
+class ValenceScorer:
+    """
+    Drop-in replacement for SentimentIntensityAnalyzer(...).polarity_scores(text)['compound'].
+
+    Args:
+        vader: Analyzer whose lexicon and emoji table are used
+        cache_size: Distinct words whose features are memoized
+    """
+
+    def __init__(self, vader: SentimentIntensityAnalyzer, cache_size: int = 100000):
+        self.vader = vader
+        self.lexicon = vader.lexicon
+        self._emoji_chars = frozenset(key for key in vader.emojis if len(key) == 1)
+        self._words = LRUCache(cache_size)
+
+    def has_emoji(self, text: str) -> bool:
+        return not self._emoji_chars.isdisjoint(text)
+
+    def _features(self, raw: str) -> _Word:
+        features = self._words.get(raw)
+        if features is None:
+            features = _Word(raw, self.lexicon)
+            self._words.put(raw, features)
+        return features
+
+    def compound(self, text: str) -> float:
+        """Compound score of a context string, equal to polarity_scores(text)['compound']."""
+        if self.has_emoji(text):
+            return self.vader.polarity_scores(text)['compound']
+        return self.compound_words(text.split(), text)
+
+    def compound_words(self, raw_words: Sequence[str], text: str) -> float:
+        """
+        Compound score of a context given as its whitespace-separated words.
+
+        Args:
+            raw_words: text.split(), or the texts of the spaCy tokens that were joined into it
+            text: The context (only its '!' and '?' counts are used)
+        """
+        words = [self._features(raw) for raw in raw_words]
+        if not words:
+            return 0.0
+
+        sentiments = self._sentiments(words)
+        if 'but' in (w.lower for w in words):
+            sentiments = SentimentIntensityAnalyzer._but_check([w.lower for w in words], sentiments)
+
+        sum_s = float(sum(sentiments))
+        amplifier = self._punctuation_emphasis(text)
+        if sum_s > 0:
+            sum_s += amplifier
+        elif sum_s < 0:
+            sum_s -= amplifier
+
+        compound = sum_s / math.sqrt((sum_s * sum_s) + 15)
+        return round(max(-1.0, min(1.0, compound)), 4)
+
+    @staticmethod
+    def _punctuation_emphasis(text: str) -> float:
+        amplifier = min(text.count('!'), 4) * 0.292
+        question_marks = text.count('?')
+        if question_marks > 1:
+            amplifier += question_marks * 0.18 if question_marks <= 3 else 0.96
+        return amplifier
+
+    def _sentiments(self, words: List[_Word]) -> List[float]:
+        n = len(words)
+        lowers = [w.lower for w in words]
+        upper_count = sum(1 for w in words if w.is_upper)
+        is_cap_diff = 0 < n - upper_count < n
+
+        sentiments = []
+        for i, w in enumerate(words):
+            if w.booster is not None or (w.lower == 'kind' and i < n - 1 and lowers[i + 1] == 'of'):
+                sentiments.append(0)
+            elif w.valence is None:
+                sentiments.append(0)
+            else:
+                sentiments.append(self._valence(words, lowers, i, is_cap_diff))
+        return sentiments
+
+    def _valence(self, words: List[_Word], lowers: List[str], i: int, is_cap_diff: bool) -> float:
+        # Mirrors SentimentIntensityAnalyzer.sentiment_valence for a lexicon word
+        lexicon = self.lexicon
+        word = words[i]
+        valence = word.valence
+
+        if word.lower == 'no' and i != len(words) - 1 and words[i + 1].valence is not None:
+            valence = 0.0
+        if ((i > 0 and lowers[i - 1] == 'no') or (i > 1 and lowers[i - 2] == 'no') or
+                (i > 2 and lowers[i - 3] == 'no' and lowers[i - 1] in ('or', 'nor'))):
+            valence = word.valence * N_SCALAR
+
+        if word.is_upper and is_cap_diff:
+            valence = valence + C_INCR if valence > 0 else valence - C_INCR
+
+        for start_i in range(3):
+            if i > start_i and lowers[i - (start_i + 1)] not in lexicon:
+                preceding = words[i - (start_i + 1)]
+                s = 0.0
+                if preceding.booster is not None:
+                    s = preceding.booster if valence >= 0 else -preceding.booster
+                    if preceding.is_upper and is_cap_diff:
+                        s = s + C_INCR if valence > 0 else s - C_INCR
+                if start_i == 1 and s != 0:
+                    s = s * 0.95
+                if start_i == 2 and s != 0:
+                    s = s * 0.9
+                valence = valence + s
+                valence = self._negation_check(valence, words, lowers, start_i, i)
+                if start_i == 2:
+                    valence = self._special_idioms_check(valence, lowers, i)
+
+        return self._least_check(valence, lowers, i)
+
+    @staticmethod
+    def _negation_check(valence: float, words: List[_Word], lowers: List[str], start_i: int, i: int) -> float:
+        if start_i == 0:
+            if words[i - 1].negation:
+                valence = valence * N_SCALAR
+        elif start_i == 1:
+            if lowers[i - 2] == 'never' and lowers[i - 1] in ('so', 'this'):
+                valence = valence * 1.25
+            elif lowers[i - 2] == 'without' and lowers[i - 1] == 'doubt':
+                pass
+            elif words[i - 2].negation:
+                valence = valence * N_SCALAR
+        else:
+            if ((lowers[i - 3] == 'never' and lowers[i - 2] in ('so', 'this')) or
+                    lowers[i - 1] in ('so', 'this')):
+                valence = valence * 1.25
+            elif lowers[i - 3] == 'without' and (lowers[i - 2] == 'doubt' or lowers[i - 1] == 'doubt'):
+                pass
+            elif words[i - 3].negation:
+                valence = valence * N_SCALAR
+        return valence
+
+    @staticmethod
+    def _special_idioms_check(valence: float, lowers: List[str], i: int) -> float:
+        onezero = f"{lowers[i - 1]} {lowers[i]}"
+        twoonezero = f"{lowers[i - 2]} {lowers[i - 1]} {lowers[i]}"
+        twoone = f"{lowers[i - 2]} {lowers[i - 1]}"
+        threetwoone = f"{lowers[i - 3]} {lowers[i - 2]} {lowers[i - 1]}"
+        threetwo = f"{lowers[i - 3]} {lowers[i - 2]}"
+
+        for seq in (onezero, twoonezero, twoone, threetwoone, threetwo):
+            if seq in SPECIAL_CASES:
+                valence = SPECIAL_CASES[seq]
+                break
+
+        if len(lowers) - 1 > i:
+            zeroone = f"{lowers[i]} {lowers[i + 1]}"
+            if zeroone in SPECIAL_CASES:
+                valence = SPECIAL_CASES[zeroone]
+        if len(lowers) - 1 > i + 1:
+            zeroonetwo = f"{lowers[i]} {lowers[i + 1]} {lowers[i + 2]}"
+            if zeroonetwo in SPECIAL_CASES:
+                valence = SPECIAL_CASES[zeroonetwo]
+
+        for n_gram in (threetwoone, threetwo, twoone):
+            if n_gram in BOOSTER_DICT:
+                valence = valence + BOOSTER_DICT[n_gram]
+        return valence
+
+    def _least_check(self, valence: float, lowers: List[str], i: int) -> float:
+        if i > 1 and lowers[i - 1] not in self.lexicon and lowers[i - 1] == 'least':
+            if lowers[i - 2] != 'at' and lowers[i - 2] != 'very':
+                valence = valence * N_SCALAR
+        elif i > 0 and lowers[i - 1] not in self.lexicon and lowers[i - 1] == 'least':
+            valence = valence * N_SCALAR
+        return valence
@@ -0,0 +1,54 @@
+# Tests for the micro-benchmark timing and baseline comparison
+import sys
+sys.path.insert(0, '.')
+from src.benchmark import BenchmarkCase, compare, run_benchmarks, time_case
+
+
+def test_time_case_resets_before_every_run():
+    calls = []
+    case = BenchmarkCase('count', run=lambda: calls.append('run'), items=4, reset=lambda: calls.append('reset'))
+
+    timing = time_case(case, repeat=3, warmup=1)
+
+    assert calls == ['reset', 'run'] * 4
+    assert timing['items'] == 4 and timing['repeat'] == 3
+    assert timing['min_seconds'] <= timing['median_seconds']
+
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    baseline = {'results': {'parse': {'small': {'median_seconds': 1.0}, 'full': {'median_seconds': 2.0}}}}
+    current = {'results': {'parse': {'small': {'median_seconds': 1.1}, 'full': {'median_seconds': 3.0}},
+                           'new_case': {'small': {'median_seconds': 1.0}}}}
+
+    rows = {(row['case'], row['size']): row for row in compare(current, baseline, tolerance=0.2)}
+
+    assert set(rows) == {('parse', 'small'), ('parse', 'full')}
+    assert not rows['parse', 'small']['regression']
+    assert rows['parse', 'full']['regression']
+
+
+def test_run_benchmarks_reports_unavailable_suites(monkeypatch):
+    import src.benchmark as benchmark
+
+    def missing():
+        raise OSError("model not cached")
+
+    monkeypatch.setattr(benchmark, 'SUITES', {'transformer': (missing, benchmark.transformer_cases)})
+    report = run_benchmarks(sizes=['small'], repeat=1)
+
+    assert report['results'] == {}
+    assert 'model not cached' in report['skipped']['transformer']
+
+
+def test_transformer_suites_load_from_the_local_cache_only(monkeypatch):
+    import types
+    import src.benchmark as benchmark
+
+    seen = []
+    stub = types.ModuleType('src.transformer_absa')
+    stub.TransformerABSA = lambda **kwargs: seen.append(kwargs)
+    monkeypatch.setitem(sys.modules, 'src.transformer_absa', stub)
+    for suite in ('transformer', 'transformer_int8', 'transformer_onnx'):
+        benchmark.SUITES[suite][0]()
+
+    assert seen == [{'backend': backend, 'local_files_only': True} for backend in ('fp32', 'int8', 'onnx')]
@@ -0,0 +1,112 @@
+# Tests for the shared LRU / SQLite result caches
+import sqlite3
+import sys
+sys.path.insert(0, '.')
+from src.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_sqlite_cache_persists_and_bounds_size(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SQLiteCache(path, max_entries=3)
+    for i in range(5):
+        cache.put(str(i), {'label': 'positive', 'score': i / 10})
+    cache.close()
+
+    reopened = SQLiteCache(path, max_entries=3)
+    assert len(reopened) == 3
+    assert reopened.get('0') is None
+    assert reopened.get('4') == {'label': 'positive', 'score': 0.4}
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = SQLiteCache(str(tmp_path / 'cache.db'))
+    disk.put('k', {'score': 1.0})
+    cache = TieredCache(LRUCache(10), disk)
+
+    assert cache.get('k') == {'score': 1.0}
+    assert 'k' in cache.memory
+
+
+def test_cache_key_separates_parts():
+    assert make_cache_key('ab', 'c') != make_cache_key('a', 'bc')
+
+
+def test_sqlite_cache_ttl_and_read_only(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SQLiteCache(path, ttl_seconds=-1)
+    cache.put('old', 1)
+    assert cache.get('old') is None
+
+    SQLiteCache(path).put('k', 2)
+    read_only = SQLiteCache(path, read_only=True)
+    read_only.put('new', 3)
+    assert read_only.get('k') == 2
+    assert read_only.get('new') is None
+
+
+def test_sqlite_cache_batches_access_times_and_counts_other_writers(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SQLiteCache(path, max_entries=3, flush_every=100)
+    cache.put_many([('a', 1), ('b', 2)])
+    assert cache.get('a') == 1
+    assert cache._accessed  # not written yet
+
+    # Another process's writes count towards max_entries; 'b' is least recently used
+    SQLiteCache(path, max_entries=None).put('c', 3)
+    cache.put('d', 4)
+    assert not cache._accessed
+    assert len(cache) == 3
+    assert cache.get('b') is None and cache.get('a') == 1
+
+
+def test_sqlite_cache_lock_errors_degrade_to_misses(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SQLiteCache(path, timeout=0.01)
+    cache.put('k', 1)
+
+    blocker = sqlite3.connect(path)
+    blocker.execute('BEGIN EXCLUSIVE')
+    try:
+        assert cache.get('k') is None
+        cache.put('other', 2)  # logged, not raised
+    finally:
+        blocker.rollback()
+    assert cache.get('k') == 1
+
+
+def test_sqlite_cache_clear_logs_lock_errors(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SQLiteCache(path, timeout=0.01)
+    cache.put('k', 1)
+
+    blocker = sqlite3.connect(path)
+    blocker.execute('BEGIN EXCLUSIVE')
+    try:
+        cache.clear()  # logged, not raised
+    finally:
+        blocker.rollback()
+    assert cache.get('k') == 1
+
+
+def test_sqlite_cache_read_only_missing_file_is_empty(tmp_path):
+    path = tmp_path / 'missing.db'
+    cache = SQLiteCache(str(path), read_only=True)
+    cache.put('k', 1)
+
+    assert cache.get('k') is None
+    assert len(cache) == 0
+    cache.clear()
+    assert not path.exists()
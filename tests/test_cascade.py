@@ -0,0 +1,73 @@
+# Test confidence-based cascade (Lexicon -> Transformer -> LLM)
+import sys
+sys.path.insert(0, '.')
+from src.base import AspectSentiment
+from src.cascade_absa import CascadeABSA
+
+
+class FixedTransformer:
+    def __init__(self, score):
+        self.score = score
+        self.pairs = []
+
+    def _classify_pairs(self, pairs):
+        self.pairs.extend(pairs)
+        return [{'label': 'neutral', 'score': self.score} for _ in pairs]
+
+
+class EchoLLM:
+    def __init__(self, results=()):
+        self.texts = []
+        self.results = list(results)
+
+    def analyze(self, text):
+        self.texts.append(text)
+        return self.results
+
+
+def test_cascade_escalates_only_uncertain_aspects():
+    transformer = FixedTransformer(score=0.99)
+    llm = EchoLLM()
+    analyzer = CascadeABSA(transformer=transformer, llm=llm, lexicon_threshold=0.3)
+    text = "The pizza was delicious but the service was terrible."
+    results = analyzer.analyze(text)
+
+    print(f"\nAnalyzing: '{text}'")
+    for result in results:
+        print(result)
+
+    escalated = [r for r in results if r.sentiment == 'neutral']
+    assert len(transformer.pairs) == len(escalated)
+    assert llm.texts == []
+
+    stats = analyzer.tier_stats()
+    assert stats['lexicon']['reviews'] == 1
+    assert stats['transformer']['aspects'] == len(escalated)
+
+
+def test_cascade_sends_still_uncertain_reviews_to_llm():
+    llm = EchoLLM()
+    analyzer = CascadeABSA(transformer=FixedTransformer(score=0.1), llm=llm,
+                           lexicon_threshold=1.1, transformer_threshold=0.5)
+    analyzer.analyze_batch(["The pizza was delicious.", "The staff was friendly."])
+
+    assert len(llm.texts) == 2
+    stats = analyzer.tier_stats()
+    assert stats['llm']['reviews_fraction'] == 1.0
+    assert stats['llm']['unmatched_reviews'] == 2
+    assert stats['lexicon']['seconds'] > 0
+
+
+def test_cascade_matches_llm_aspects_after_normalization():
+    llm = EchoLLM([AspectSentiment(aspect="The Pizza", sentiment='negative', confidence=0.9)])
+    analyzer = CascadeABSA(transformer=FixedTransformer(score=0.1), llm=llm,
+                           lexicon_threshold=1.1, transformer_threshold=0.5)
+    results = analyzer.analyze("The pizza was delicious.")
+
+    pizza = [r for r in results if r.aspect.lower() == 'pizza']
+    assert pizza and pizza[0].sentiment == 'negative' and pizza[0].confidence == 0.9
+    assert analyzer.tier_stats()['llm']['unmatched_aspects'] == len(results) - len(pizza)
+
+
+if __name__ == "__main__":
+    test_cascade_escalates_only_uncertain_aspects()
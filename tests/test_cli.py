@@ -0,0 +1,43 @@
+# Tests for the streaming command line interface (python -m src)
+import json
+import sys
+sys.path.insert(0, '.')
+from src.__main__ import main
+from src.reviews import read_reviews
+from src.base import ABSAAnalyzer, AspectSentiment
+
+
+class WordAnalyzer(ABSAAnalyzer):
+    """Reports every word as a neutral aspect"""
+
+    def analyze(self, text):
+        return [AspectSentiment(aspect=word, sentiment='neutral', confidence=1.0) for word in text.split()]
+
+
+def test_read_reviews_csv_with_bom(tmp_path):
+    path = tmp_path / 'reviews.csv'
+    path.write_text('﻿Review Text,Stars\n"Great, tasty pizza",5\n"Multi\nline",3\n', encoding='utf-8')
+
+    assert list(read_reviews(str(path))) == ['Great, tasty pizza', 'Multi\nline']
+
+
+def test_read_reviews_jsonl(tmp_path):
+    path = tmp_path / 'reviews.jsonl'
+    path.write_text('{"text": "good food"}\n\n"plain string"\n{"other": 1}\n', encoding='utf-8')
+
+    assert list(read_reviews(str(path))) == ['good food', 'plain string', '']
+
+
+def test_cli_writes_jsonl(tmp_path, capsys):
+    source = tmp_path / 'reviews.csv'
+    source.write_text('Review Text\nnice pizza\nslow service here\n', encoding='utf-8')
+    output = tmp_path / 'out.jsonl'
+
+    main([str(source), '--analyzer', f'{__name__}:WordAnalyzer', '--output', str(output),
+          '--include-text', '--batch-size', '1'])
+
+    records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert [r['id'] for r in records] == [0, 1]
+    assert [r['text'] for r in records] == ['nice pizza', 'slow service here']
+    assert [a['aspect'] for a in records[1]['aspects']] == ['slow', 'service', 'here']
+    assert '2 reviews, 5 aspects' in capsys.readouterr().err
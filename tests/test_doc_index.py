@@ -0,0 +1,33 @@
+# Tests for the per-Doc char-offset index used by aspect extraction
+import random
+import sys
+sys.path.insert(0, '.')
+import spacy
+from src.utils import DocIndex
+
+
+def scan_token_range(doc, start_char, end_char):
+    # Reference: the linear scan the index replaces
+    token_start = None
+    token_end = None
+    for tok in doc:
+        if tok.idx >= start_char and token_start is None:
+            token_start = tok.i
+        if tok.idx + len(tok.text) <= end_char:
+            token_end = tok.i + 1
+    return token_start, token_end
+
+
+def test_token_range_matches_linear_scan():
+    doc = spacy.blank('en')("The cookies and creme, waffle cones & pumpkin shakes were great!  Staff: friendly.")
+    index = DocIndex(doc)
+    rng = random.Random(0)
+
+    for _ in range(500):
+        start = rng.randrange(len(doc.text) + 1)
+        end = rng.randrange(start, len(doc.text) + 2)
+        expected_start, expected_end = scan_token_range(doc, start, end)
+        token_start, token_end = index.token_range(start, end)
+
+        assert token_start == (expected_start if expected_start is not None else len(doc))
+        assert token_end == (expected_end or 0)
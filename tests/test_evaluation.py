@@ -0,0 +1,54 @@
+# Tests for scoring analyzers against gold annotations
+import sys
+import pytest
+sys.path.insert(0, '.')
+from src.base import ABSAAnalyzer, AspectSentiment
+from src.evaluation import evaluate, load_gold, match_review, score
+
+
+class GoldAnalyzer(ABSAAnalyzer):
+    """Returns the gold annotations of known texts"""
+
+    def __init__(self, gold):
+        self.answers = {entry['text']: entry['expected'] for entry in gold}
+
+    def analyze(self, text):
+        return [AspectSentiment(e['aspect'], e['sentiment'], 1.0) for e in self.answers[text]]
+
+
+def test_match_review_exact_before_fuzzy():
+    predicted = ['pumpkin shake', 'ice cream', 'staff members']
+    gold = ['ice cream', 'shake', 'staff']
+
+    assert sorted(match_review(predicted, gold)) == [(0, 1), (1, 0), (2, 2)]
+    assert match_review(predicted, gold, fuzzy_threshold=1.01) == [(1, 0)]
+
+
+def test_score_counts_sentiment_on_matched_aspects():
+    predictions = [[('Ice cream', 'positive'), ('parking', 'negative')], [('the staff', 'negative')]]
+    gold = [[{'aspect': 'ice cream', 'sentiment': 'positive'}], [{'aspect': 'staff', 'sentiment': 'positive'}]]
+
+    result = score(predictions, gold)
+
+    assert result['matched'] == 2
+    assert result['precision'] == 2 / 3
+    assert result['recall'] == 1.0
+    assert result['sentiment_accuracy'] == 0.5
+    assert result['pair_recall'] == 0.5
+
+
+def test_score_rejects_mismatched_review_counts():
+    gold = [[{'aspect': 'staff', 'sentiment': 'positive'}], [{'aspect': 'pizza', 'sentiment': 'negative'}]]
+
+    with pytest.raises(ValueError, match='1 reviews but gold for 2'):
+        score(iter([[('staff', 'positive')]]), gold)
+
+
+def test_evaluate_perfect_analyzer_on_gold_file():
+    gold = load_gold('data/tests.json')
+
+    report = evaluate(GoldAnalyzer(gold), gold)
+
+    assert report['accuracy']['f1'] == 1.0
+    assert report['accuracy']['sentiment_accuracy'] == 1.0
+    assert report['speed']['texts_processed'] == len(gold)
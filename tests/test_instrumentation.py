@@ -0,0 +1,47 @@
+# Tests for stage timers, counters and profiling hooks
+import json
+import sys
+sys.path.insert(0, '.')
+from src.base import ABSAAnalyzer, AspectSentiment
+from src.instrumentation import NULL_INSTRUMENTATION, LatencyHistogram, StageRecorder
+
+
+class StagedAnalyzer(ABSAAnalyzer):
+    def analyze(self, text):
+        with self.instrumentation.call(), self.instrumentation.stage('analyze'):
+            self.instrumentation.count('aspects', len(text.split()))
+            return [AspectSentiment(word, 'neutral', 1.0) for word in text.split()]
+
+
+def test_histogram_percentiles_within_bucket_width():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+
+    assert histogram.count == 100
+    assert 0.050 <= histogram.percentile(50) <= 0.050 * 1.2
+    assert histogram.percentile(100) == histogram.max == 0.1
+
+
+def test_analyzers_default_to_no_op_instrumentation():
+    analyzer = StagedAnalyzer()
+    analyzer.analyze("good pizza")
+
+    assert analyzer.instrumentation is NULL_INSTRUMENTATION
+    assert NULL_INSTRUMENTATION.stats() == {}
+
+
+def test_recorder_collects_stages_counters_and_profiles(tmp_path):
+    analyzer = StagedAnalyzer()
+    recorder = analyzer.instrument(StageRecorder(profile=True, keep_call_profiles=1))
+
+    analyzer.analyze_batch(["good pizza", "slow service today"])
+
+    stats = recorder.stats()
+    assert stats['stages']['analyze']['calls'] == 2
+    assert stats['counters'] == {'aspects': 5}
+    assert 'function calls' in recorder.profile_report()
+    assert len(recorder.slowest_calls) == 1
+
+    recorder.export(str(tmp_path / 'stats.json'))
+    assert json.loads((tmp_path / 'stats.json').read_text())['counters'] == {'aspects': 5}
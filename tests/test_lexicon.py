@@ -14,5 +14,19 @@ def test_lexicon_absa():
     assert len(results) > 0
 
 
+def test_lexicon_analyze_batch_matches_analyze():
+    analyzer = LexiconABSA()
+    texts = [
+        "The pizza was delicious but the service was terrible.",
+        "Their waffle cone (made fresh) was amazing.",
+        "",
+    ]
+    batch_results = analyzer.analyze_batch(texts, batch_size=2)
+
+    assert len(batch_results) == len(texts)
+    for text, results in zip(texts, batch_results):
+        assert [str(r) for r in results] == [str(r) for r in analyzer.analyze(text)]
+
+
 if __name__ == "__main__":
     test_lexicon_absa()
@@ -0,0 +1,31 @@
+# Tests for the compiled aspect filter lexicons
+import sys
+sys.path.insert(0, '.')
+from src.lexicons import PrefixTrie, SubstringMatcher, load_aspect_filters
+
+
+def test_substring_matcher_matches_naive_scan():
+    patterns = ['us', 'we', 'star', 'review', 'law', 'she']
+    matcher = SubstringMatcher(patterns)
+
+    for text in ['ice cream', 'customer service', 'answer', 'stars', 'sister-in-law', 'pizza', 'ushers']:
+        assert matcher.search(text) == any(p in text for p in patterns)
+
+
+def test_prefix_trie():
+    trie = PrefixTrie(['my ', 'what', 'kind of'])
+
+    assert trie.matches_prefix('my ice cream')
+    assert trie.matches_prefix("what's good")
+    assert not trie.matches_prefix('kind staff')
+    assert not trie.matches_prefix('mystery flavor')
+
+
+def test_default_filters():
+    filters = load_aspect_filters()
+
+    assert filters.is_excluded('thing')
+    assert filters.is_excluded('our server')
+    assert filters.is_excluded('google reviews')
+    assert not filters.is_excluded('pumpkin shake')
+    assert filters.is_excluded_proper_noun('walmart')
@@ -1,10 +1,15 @@
-
-
-
 # Test Implementation 3 - LLM with Ollama
+import asyncio
+import json
+import re
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import ollama
 sys.path.insert(0, '.')
-from src.llm_absa import LLMABSA
+from src.instrumentation import StageRecorder
+from src.llm_absa import IncrementalAspectParser, LLMABSA
 def test_llm_absa():
     analyzer = LLMABSA()
     text = "The pizza was delicious but the service was terrible."
@@ -15,5 +20,219 @@ def test_llm_absa():
         print(result)
 
 
+class StubOllamaServer(ThreadingHTTPServer):
+    """Mimics Ollama's /api/chat: echoes the review's first word back as a positive aspect"""
+
+    def __init__(self, delay=0.0, drop_ids=()):
+        super().__init__(('127.0.0.1', 0), StubChatHandler)
+        self.delay = delay
+        self.drop_ids = set(drop_ids)  # review ids left out of packed responses
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def host(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests.append(body)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+
+        time.sleep(server.delay)
+        prompt = body['messages'][0]['content']
+        if 'Text: "' in prompt:
+            review = prompt.split('Text: "', 1)[1].split('"', 1)[0]
+            content = self.aspects_for(review)
+        else:
+            content = {
+                review_id: self.aspects_for(review)
+                for review_id, review in re.findall(r'^\[(r\d+)\] "(.*)"$', prompt, re.MULTILINE)
+                if review_id not in server.drop_ids
+            }
+        payload = json.dumps({
+            'model': body['model'],
+            'created_at': '2024-01-01T00:00:00Z',
+            'message': {'role': 'assistant', 'content': json.dumps(content)},
+            'done': True
+        }).encode()
+
+        with server.lock:
+            server.in_flight -= 1
+
+        if body.get('stream'):
+            # NDJSON chunks of the answer, a few characters at a time
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+            text = json.dumps(content)
+            for start in range(0, len(text), 7):
+                self.wfile.write(json.dumps({
+                    'model': body['model'],
+                    'created_at': '2024-01-01T00:00:00Z',
+                    'message': {'role': 'assistant', 'content': text[start:start + 7]},
+                    'done': False
+                }).encode() + b'\n')
+                self.wfile.flush()
+            self.wfile.write(json.dumps({
+                'model': body['model'],
+                'created_at': '2024-01-01T00:00:00Z',
+                'message': {'role': 'assistant', 'content': ''},
+                'done': True
+            }).encode() + b'\n')
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    @staticmethod
+    def aspects_for(review):
+        return {'aspects': [{'aspect': review.split()[0], 'sentiment': 'Positive', 'confidence': 0.9}]}
+
+    def log_message(self, *args):
+        pass
+
+
+def test_llm_analyze_many_async_bounds_concurrency_and_keeps_order():
+    texts = [f"review{i} was great" for i in range(8)]
+    with StubOllamaServer(delay=0.1) as server:
+        analyzer = LLMABSA(host=server.host, max_concurrency=3)
+        results = asyncio.run(analyzer.analyze_many_async(texts))
+
+    assert [r[0].aspect for r in results] == [f"review{i}" for i in range(8)]
+    assert results[0][0].sentiment == 'positive'
+    assert server.max_in_flight == 3
+
+
+def test_llm_analyze_async_times_out():
+    with StubOllamaServer(delay=1.0) as server:
+        analyzer = LLMABSA(host=server.host, request_timeout=0.1)
+        assert asyncio.run(analyzer.analyze_async("slow review")) == []
+
+
+def test_llm_analyze_many_async_closes_its_client_and_counts_cache_hits(monkeypatch):
+    closed = []
+
+    class RecordingClient(ollama.AsyncClient):
+        async def close(self):
+            closed.append(self)
+            await super().close()
+
+    monkeypatch.setattr(ollama, 'AsyncClient', RecordingClient)
+    with StubOllamaServer() as server:
+        analyzer = LLMABSA(host=server.host)
+        recorder = analyzer.instrument(StageRecorder())
+        asyncio.run(analyzer.analyze_many_async(["pizza was great", "pasta was cold"]))
+        asyncio.run(analyzer.analyze_async("pasta was cold"))
+        asyncio.run(analyzer.analyze_async("soup was hot"))
+
+    # one client shared by analyze_many_async, one opened by the standalone miss
+    assert len(closed) == 2
+    assert recorder.counters == {'cache_misses': 3, 'cache_hits': 1}
+
+
+def test_llm_response_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / 'llm_cache.db')
+    with StubOllamaServer() as server:
+        first = LLMABSA(host=server.host, cache_path=path).analyze("pizza was great")
+        replay = LLMABSA(host=server.host, cache_path=path, cache_read_only=True)
+        assert [str(r) for r in replay.analyze("pizza was great")] == [str(r) for r in first]
+        replay.analyze("service was slow")
+
+    assert len(server.requests) == 2
+    assert len(replay.cache.disk) == 1
+
+
+def test_llm_packed_prompts_split_results_and_fall_back():
+    texts = [f"dish{i} was tasty" for i in range(5)]
+    with StubOllamaServer(drop_ids={'r2'}) as server:
+        analyzer = LLMABSA(host=server.host)
+        results = analyzer.analyze_packed(texts, token_budget=10000, max_reviews_per_prompt=3)
+
+    assert [r[0].aspect for r in results] == [f"dish{i}" for i in range(5)]
+    # two packed requests (3 + 2 reviews) plus one single-review retry per dropped id
+    assert len(server.requests) == 4
+
+
+def test_llm_packing_respects_token_budget():
+    analyzer = LLMABSA()
+    overhead = analyzer._estimate_tokens(analyzer._create_packed_prompt([]))
+    texts = ["x" * 400] * 4  # ~105 tokens each with tagging
+    packs = analyzer._pack_reviews(texts, token_budget=overhead + 250, max_reviews_per_prompt=10)
+
+    assert packs == [[0, 1], [2, 3]]
+
+
+def test_incremental_parser_emits_each_closed_aspect():
+    response = json.dumps({
+        'note': {'aspects': [{'aspect': 'decoy'}]},
+        'aspects': [
+            {'aspect': 'pizza {crust}', 'sentiment': 'positive', 'confidence': 0.9},
+            {'aspect': 'the "staff"', 'sentiment': 'negative', 'confidence': 0.8},
+        ]
+    })
+    parser = IncrementalAspectParser()
+    emitted = []
+    for char in response:
+        emitted.extend(item['aspect'] for item in parser.feed(char))
+        if char == '}' and len(emitted) == 1:
+            # first aspect available before the response is complete
+            assert emitted == ['pizza {crust}']
+
+    assert emitted == ['pizza {crust}', 'the "staff"']
+
+
+def test_llm_stream_aspects():
+    with StubOllamaServer() as server:
+        analyzer = LLMABSA(host=server.host)
+        streamed = list(analyzer.stream_aspects("waffles were fantastic"))
+        cached = list(analyzer.stream_aspects("waffles were fantastic"))
+
+    assert [a.aspect for a in streamed] == ['waffles']
+    assert [str(a) for a in cached] == [str(a) for a in streamed]
+    assert len(server.requests) == 1
+
+
+def test_llm_stream_aspects_does_not_cache_skipped_items(monkeypatch):
+    def with_bad_item(review):
+        return {'aspects': [{'aspect': review.split()[0], 'sentiment': 'Positive', 'confidence': 0.9},
+                            {'aspect': 'service', 'sentiment': 'negative'}]}
+
+    monkeypatch.setattr(StubChatHandler, 'aspects_for', staticmethod(with_bad_item))
+    with StubOllamaServer() as server:
+        analyzer = LLMABSA(host=server.host)
+        recorder = analyzer.instrument(StageRecorder())
+        streamed = list(analyzer.stream_aspects("waffles were fantastic"))
+        analyzed = analyzer.analyze("waffles were fantastic")
+
+    assert [a.aspect for a in streamed] == ['waffles']
+    assert analyzed == [] and len(server.requests) == 2
+
+    # malformed entries already in the cache are logged, not raised
+    analyzer.cache.put(analyzer._cache_key(analyzer._create_prompt("soup")), {'aspects': [{'aspect': 'soup'}]})
+    assert analyzer.analyze("soup") == []
+    assert list(analyzer.stream_aspects("soup")) == []
+    assert asyncio.run(analyzer.analyze_async("soup")) == []
+    assert recorder.counters == {'cache_misses': 2, 'cache_hits': 3}
+
+
 if __name__ == "__main__":
-    test_llm_absa()
\ No newline at end of file
+    test_llm_absa()
@@ -0,0 +1,110 @@
+# Tests for single-pass metrics collection
+import sys
+import tracemalloc
+sys.path.insert(0, '.')
+from src.base import ABSAAnalyzer, AspectSentiment
+from src.metrics import CorpusRecording
+from src.startup import measure_startup
+
+
+class CountingAnalyzer(ABSAAnalyzer):
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, text):
+        self.calls += 1
+        return [AspectSentiment(aspect=word, sentiment='neutral', confidence=0.5)
+                for word in text.split()]
+
+
+def test_all_metrics_analyze_corpus_once():
+    analyzer = CountingAnalyzer()
+    texts = ["pizza service", "staff", ""]
+    metrics = analyzer.calculate_all_metrics(texts, include_initialization=False)
+
+    assert analyzer.calls == len(texts)
+    assert metrics['speed']['texts_processed'] == 3
+    assert metrics['aspects_detected']['total'] == 3
+    assert metrics['avg_confidence']['avg'] == 0.5
+
+
+def test_recording_round_trip_rebuilds_report(tmp_path):
+    analyzer = CountingAnalyzer()
+    recording = analyzer.record_corpus(["pizza service", "staff"])
+    path = str(tmp_path / 'recording.json')
+    recording.save(path)
+
+    rebuilt = analyzer.calculate_all_metrics([], include_initialization=False,
+                                             recording=CorpusRecording.load(path))
+    assert analyzer.calls == 2
+    assert rebuilt == recording.report()
+
+
+def test_memory_profile_reports_traced_and_rss_memory():
+    analyzer = CountingAnalyzer()
+    memory = analyzer.calculate_memory_usage(["pizza service " * 200, "staff"])
+
+    assert memory['peak_memory_mb'] > 0
+    assert memory['peak_memory_mb'] >= memory['avg_memory_per_text_mb']
+    assert memory['stages']['analyze']['calls'] == 2
+    assert 'rss_lifetime_peak_mb' in memory and 'rss_delta_mb' in memory
+
+
+class TracingAwareAnalyzer(CountingAnalyzer):
+    def __init__(self):
+        super().__init__()
+        self.traced = []
+
+    def analyze(self, text):
+        self.traced.append(tracemalloc.is_tracing())
+        return super().analyze(text)
+
+
+def test_memory_profiling_runs_outside_the_timed_passes():
+    analyzer = TracingAwareAnalyzer()
+    texts = ["pizza service", "staff"]
+    recording = analyzer.record_corpus(texts, profile_memory=True, repeat=2)
+
+    assert analyzer.traced == [True] * len(texts) + [False] * 2 * len(texts)
+    assert len(recording.run_times) == 2
+    assert all(len(call.timings) == 2 for call in recording.calls)
+    assert all(call.memory_mb is not None for call in recording.calls)
+    assert recording.memory_profile['stages']['analyze']['calls'] == len(texts)
+
+
+def test_startup_breakdown():
+    startup = measure_startup(__name__, 'CountingAnalyzer', steady_state_runs=3)
+
+    for key in ('import_seconds', 'init_seconds', 'first_inference_seconds', 'steady_state_seconds'):
+        assert startup[key] >= 0
+    assert startup['components'] == {}
+
+
+class ConfiguredAnalyzer(CountingAnalyzer):
+    def __init__(self, threshold=0.5, backend='fp32', nlp=None):
+        super().__init__()
+
+
+def test_startup_profile_uses_instance_constructor_arguments(monkeypatch):
+    import src.base as base
+    seen = {}
+    monkeypatch.setattr(base, 'profile_startup',
+                        lambda module, name, text, analyzer_kwargs, warm: seen.update(analyzer_kwargs) or {})
+
+    ConfiguredAnalyzer(0.9, backend='onnx', nlp=object()).calculate_startup_profile(warm=False)
+
+    assert seen == {'threshold': 0.9, 'backend': 'onnx'}
+
+
+def test_speed_warmup_repeat_and_latency_percentiles():
+    analyzer = CountingAnalyzer()
+    texts = ["pizza " * n for n in range(1, 60)]
+    speed = analyzer.calculate_speed(texts, warmup=2, repeat=3)
+
+    assert analyzer.calls == 2 + 3 * len(texts)
+    assert speed['texts_processed'] == len(texts)
+    assert speed['p50_latency'] <= speed['p90_latency'] <= speed['p99_latency'] <= speed['max_latency']
+    low, high = speed['p50_latency_ci95']
+    assert low <= speed['p50_latency'] <= high
+    assert sum(b['count'] for b in speed['by_length']['bins']) == len(texts)
+    assert speed['by_length']['per_word_seconds'] is not None
@@ -0,0 +1,31 @@
+# Tests for the per-Doc negation scopes of LexiconABSA
+import random
+import sys
+sys.path.insert(0, '.')
+import spacy
+from spacy.tokens import Doc
+from src.benchmark import tree_walk_negation
+from src.lexicon_absa import LexiconABSA
+
+WORDS = ['the', 'pizza', 'was', 'not', 'good', 'never', 'staff', "n't", 'no', 'service', 'none', 'and']
+DEPS = ['nsubj', 'dobj', 'amod', 'advmod', 'neg', 'conj', 'cc', 'det', 'prep', 'pobj']
+
+
+def random_doc(vocab, rng, n):
+    # Each token's head precedes it, so the heads form one tree rooted at token 0
+    heads = [0] + [rng.randrange(i) for i in range(1, n)]
+    deps = ['ROOT'] + [rng.choice(DEPS) for _ in range(1, n)]
+    return Doc(vocab, words=[rng.choice(WORDS) for _ in range(n)], heads=heads, deps=deps)
+
+
+def test_negation_scope_matches_tree_walk():
+    vocab = spacy.blank('en').vocab
+    analyzer = LexiconABSA.__new__(LexiconABSA)  # scopes need no loaded models
+    rng = random.Random(0)
+
+    for _ in range(300):
+        doc = random_doc(vocab, rng, rng.randrange(1, 40))
+        expected = [tree_walk_negation(tok) for tok in doc]
+        scope = analyzer._compute_negation_scope(doc)
+        assert [analyzer._check_negation(tok, scope) for tok in doc] == expected
+        assert [analyzer._check_negation(tok) for tok in doc] == expected
@@ -0,0 +1,24 @@
+# Tests for the memoized aspect normalizer
+import sys
+sys.path.insert(0, '.')
+from src.normalizer import AspectNormalizer
+
+
+def test_normalizer_strips_modifiers():
+    normalizer = AspectNormalizer()
+
+    assert normalizer("Their LARGE SIZE ice cream") == "size ice cream"
+    assert normalizer("the very friendly staff!") == "staff"
+    assert normalizer("pumpkin shake for dessert") == "pumpkin shake"
+    assert normalizer('"banana split"') == "banana split"
+
+
+def test_normalizer_memoizes_results():
+    normalizer = AspectNormalizer(maxsize=2)
+    for _ in range(3):
+        normalizer("the pizza")
+
+    stats = normalizer.cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 2
+    assert normalizer("the pizza") == AspectNormalizer.normalize("the pizza")
@@ -0,0 +1,38 @@
+# Tests for the slotted AspectSentiment and the columnar ResultBatch
+import pickle
+import sys
+sys.path.insert(0, '.')
+from src.base import AspectSentiment, ResultBatch
+
+RESULTS = [
+    [AspectSentiment('pizza', 'positive', 0.9, (4, 9)), AspectSentiment('service', 'negative', 0.7, (20, 27))],
+    [],
+    [AspectSentiment('pizza', 'neutral', 0.5), AspectSentiment('staff', 'mixed', 0.6, (0, 5))],
+]
+
+
+def test_aspect_sentiment_is_slotted():
+    result = AspectSentiment('pizza', 'positive', 0.9)
+    assert not hasattr(result, '__dict__')
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_result_batch_round_trip():
+    batch = ResultBatch.from_results(iter(RESULTS))
+
+    assert len(batch) == 4
+    assert batch.n_reviews == 3
+    assert batch.aspects == ['pizza', 'service', 'staff']
+    assert list(batch.iter_reviews()) == [[r for r in review] for review in RESULTS]
+    assert batch.review(1) == []
+    assert batch.review(2)[1].sentiment == 'mixed'
+    assert list(batch) == [r for review in RESULTS for r in review]
+
+
+def test_result_batch_to_dataframe():
+    df = ResultBatch.from_results(RESULTS).to_dataframe()
+
+    assert list(df['review']) == [0, 0, 2, 2]
+    assert list(df['aspect']) == ['pizza', 'service', 'pizza', 'staff']
+    assert list(df['sentiment']) == ['positive', 'negative', 'neutral', 'mixed']
+    assert list(df['span_start']) == [4, 20, -1, 0]
@@ -0,0 +1,23 @@
+# Tests for the process-pool corpus runner
+import os
+import sys
+import time
+sys.path.insert(0, '.')
+from src.base import ABSAAnalyzer, AspectSentiment
+from src.runner import run_corpus
+
+
+class PidAnalyzer(ABSAAnalyzer):
+    """Reports the worker process that produced each result"""
+
+    def analyze(self, text):
+        time.sleep(0.005)  # keeps one worker from draining the queue before the others start
+        return [AspectSentiment(aspect=text, sentiment='neutral', confidence=float(os.getpid()))]
+
+
+def test_run_corpus_keeps_order_across_workers():
+    texts = (f"review {i}" for i in range(50))
+    results = list(run_corpus(f"{__name__}:PidAnalyzer", texts, workers=3, chunk_size=4))
+
+    assert [r[0].aspect for r in results] == [f"review {i}" for i in range(50)]
+    assert len({r[0].confidence for r in results}) > 1
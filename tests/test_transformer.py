@@ -2,6 +2,10 @@
 # Test Implementation 2 - Pre-trained Model
 import sys
 sys.path.insert(0, '.')
+import pytest
+import torch
+from src.inference_backends import agreement
+from src.instrumentation import StageRecorder
 from src.transformer_absa import TransformerABSA
 def test_transformer_absa():
     analyzer = TransformerABSA()
@@ -13,5 +17,107 @@ def test_transformer_absa():
         print(result)
 
 
+def test_transformer_batched_pairs_match_single_pairs():
+    analyzer = TransformerABSA(max_batch_size=2)
+    pairs = [
+        ("The pizza was delicious but the service was terrible.", "pizza"),
+        ("The pizza was delicious but the service was terrible.", "service"),
+        ("Staff was friendly.", "staff"),
+    ]
+    batched = analyzer._classify_pairs(pairs)
+
+    for (text, aspect), prediction in zip(pairs, batched):
+        single = analyzer._run_model([(text, aspect)])[0]
+        assert prediction['label'] == single['label']
+        assert abs(prediction['score'] - single['score']) < 1e-4
+
+
+def test_transformer_cache_skips_model():
+    analyzer = TransformerABSA()
+    pair = ("The pizza was delicious.", "pizza")
+    first = analyzer._classify_pairs([pair])[0]
+
+    analyzer._run_model = lambda pairs: (_ for _ in ()).throw(AssertionError("cache miss"))
+    assert analyzer._classify_pairs([pair])[0] == first
+    assert analyzer.cache.stats()['memory']['hits'] == 1
+
+
+def test_transformer_cache_counters_are_per_pair():
+    analyzer = TransformerABSA()
+    recorder = analyzer.instrument(StageRecorder())
+    pizza, staff = ("The pizza was delicious.", "pizza"), ("The staff was rude.", "staff")
+    analyzer._classify_pairs([pizza])
+    analyzer._classify_pairs([pizza, staff, staff])
+
+    assert recorder.counters['pairs'] == 4
+    assert recorder.counters['cache_hits'] == 1 and recorder.counters['cache_misses'] == 3
+
+
+def test_transformer_batches_respect_limits():
+    analyzer = TransformerABSA(max_batch_size=3, max_tokens_per_batch=100)
+    lengths = [40, 10, 30, 10, 60, 10, 20]
+    batches = analyzer._make_batches(lengths)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= 100
+
+
+@pytest.mark.parametrize('use_fast_tokenizer', [False, True])
+def test_assembled_pair_inputs_match_tokenizer(use_fast_tokenizer):
+    analyzer = TransformerABSA(use_fast_tokenizer=use_fast_tokenizer)
+    long_review = " ".join(["The crème brûlée wasn't bad, but the 45-minute wait for our table was."] * 60)
+    pairs = [
+        ("The pizza was delicious but the service was terrible.", "pizza"),
+        ("The pizza was delicious but the service was terrible.", "service"),
+        ("Staff   were friendly 😋 — “amazing”!!", "staff"),
+        (long_review, "crème brûlée"),
+        (long_review, "wait for our table"),
+        (long_review, long_review),  # both sides truncated
+        ("Great value.", ""),
+    ]
+
+    expected = [dict(analyzer.tokenizer(text, aspect, truncation=True, max_length=512)) for text, aspect in pairs]
+    assert analyzer._encode_pairs(pairs) == expected
+    assert max(len(encoding['input_ids']) for encoding in expected) == 512
+    # Served from the sequence cache the second time
+    assert analyzer._encode_pairs(pairs) == expected
+    fast = analyzer.sequence_tokenizer is not analyzer.tokenizer
+    assert analyzer.cache_namespace.endswith(f"|{'fast' if fast else 'slow'}|512")
+
+
+def test_agreement_reports_label_flips_and_drift():
+    reference = torch.tensor([[0.7, 0.2, 0.1], [0.1, 0.3, 0.6]])
+    candidate = torch.tensor([[0.6, 0.3, 0.1], [0.1, 0.5, 0.4]])
+    report = agreement(reference, candidate)
+
+    assert report['pairs'] == 2 and report['disagreements'] == 1
+    assert report['label_agreement'] == 0.5
+    assert abs(report['max_probability_drift'] - 0.2) < 1e-6
+
+
+@pytest.mark.parametrize('backend', ['int8', 'onnx'])
+def test_backend_agrees_with_fp32_and_reuses_cached_artifact(backend, tmp_path):
+    if backend == 'onnx':
+        pytest.importorskip('onnxruntime')
+    reference = TransformerABSA()
+    pairs = [
+        ("The pizza was delicious but the service was terrible.", "pizza"),
+        ("The pizza was delicious but the service was terrible.", "service"),
+        ("Staff was friendly.", "staff"),
+    ]
+    analyzer = TransformerABSA(backend=backend, backend_cache_dir=str(tmp_path), nlp=reference.nlp)
+    report = agreement(reference._class_probabilities(pairs), analyzer._class_probabilities(pairs))
+
+    assert report['label_agreement'] == 1.0
+    assert report['max_probability_drift'] < 0.1
+    assert analyzer.cache_namespace != reference.cache_namespace
+
+    reloaded = TransformerABSA(backend=backend, backend_cache_dir=str(tmp_path), nlp=reference.nlp)
+    assert reloaded.backend.path == analyzer.backend.path
+    assert torch.allclose(reloaded._class_probabilities(pairs), analyzer._class_probabilities(pairs))
+
+
 if __name__ == "__main__":
     test_transformer_absa()
\ No newline at end of file
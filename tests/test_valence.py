@@ -0,0 +1,27 @@
+# Tests for the VADER-equivalent valence scorer
+import json
+import random
+import sys
+sys.path.insert(0, '.')
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, NEGATE, SentimentIntensityAnalyzer
+from src.valence import ValenceScorer
+
+VADER = SentimentIntensityAnalyzer()
+SCORER = ValenceScorer(VADER)
+
+
+def test_compound_matches_vader_on_gold_reviews():
+    for entry in json.load(open('data/tests.json', encoding='utf-8')):
+        for text in [entry['text']] + entry['text'].split('. '):
+            assert SCORER.compound(text) == VADER.polarity_scores(text)['compound'], text
+
+
+def test_compound_matches_vader_on_rule_heavy_contexts():
+    rng = random.Random(0)
+    words = (rng.sample(sorted(VADER.lexicon), 200) + list(BOOSTER_DICT) + NEGATE +
+             ['no', 'but', 'kind', 'of', 'least', 'at', 'never', 'so', 'this', 'without', 'doubt', 'or',
+              'the', 'shit', 'bomb', 'to', 'die', 'for', 'GREAT', 'NOT', ':)', 'good!', 'bad??', '😁'])
+
+    for _ in range(20000):
+        text = ' '.join(rng.choice(words) + rng.choice(['', '', '!', '?', ',']) for _ in range(rng.randrange(12)))
+        assert SCORER.compound(text) == VADER.polarity_scores(text)['compound'], text